@@ -12,5 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import arcgee.map as map
-import arcgee.data as data
+import importlib
+
+# The modules are imported on first use, so worker processes that only need
+# arcgee.raster do not import arcpy and Earth Engine.
+_MODULES = ("map", "data", "tiles", "cache", "raster")
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return importlib.import_module(f"arcgee.{name}")
+    raise AttributeError(f"module 'arcgee' has no attribute {name!r}")
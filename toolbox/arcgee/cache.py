@@ -0,0 +1,375 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import hashlib
+import json
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import time
+
+import arcpy  # type: ignore
+
+
+# Open getInfo result cache shared by all tools in the session.
+_getinfo_cache = None
+
+DAY = 24 * 60 * 60
+
+# Time to live of cached results keyed by the function that computes them.
+# Metadata of existing catalog images rarely changes, while collections can
+# grow. These only apply to expressions that load public catalog assets only;
+# results that depend on the user's own assets, which can be overwritten at
+# any time, use DEFAULT_TTL.
+GETINFO_TTL = {
+    "Image.bandNames": 30 * DAY,
+    "Image.projection": 30 * DAY,
+    "Projection.nominalScale": 30 * DAY,
+    "Projection.crs": 30 * DAY,
+    "Element.propertyNames": 7 * DAY,
+    "Element.get": DAY,
+    "AggregateFeatureCollection.array": 60 * 60,
+    "Collection.size": 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+# Results of expressions whose date ranges all ended this long ago are
+# treated as archived, since late scenes are rarely ingested after that.
+ARCHIVE_DELAY = 30 * DAY
+ARCHIVE_TTL = 30 * DAY
+
+
+class GetInfoCache:
+    """SQLite LRU cache of getInfo results keyed by expression hash."""
+
+    def __init__(self, db_path: str, max_bytes: int) -> None:
+        """Open the cache database and drop expired results.
+
+        Args:
+            db_path : Path to the SQLite database file.
+            max_bytes : Maximum total size of the cached results in bytes.
+        """
+        self.db_path = pathlib.Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Several ArcGIS Pro processes may share the database file.
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, call_type TEXT, value TEXT, size INTEGER, "
+                "expires REAL, accessed REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+            self._conn.execute("DELETE FROM results WHERE expires < ?", (time.time(),))
+            self._evict()
+
+    def get(self, key: str) -> tuple[bool, object]:
+        """Get a cached result.
+
+        Args:
+            key : Hash of the serialized expression.
+
+        Returns:
+            tuple[bool, object] : Whether the result is cached, and the result.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.misses += 1
+                return False, None
+            self._conn.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return True, json.loads(row[0])
+
+    def put(self, key: str, call_type: str, value: object, ttl: float) -> None:
+        """Store a result and evict the least recently used results over the size limit.
+
+        Args:
+            key : Hash of the serialized expression.
+            call_type : Name of the function that computes the result.
+            value : The result, which must be JSON serializable.
+            ttl : Time to live of the result in seconds.
+        """
+        content = json.dumps(value)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, call_type, content, len(content), now + ttl, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used results until the cache fits the size limit."""
+        total_bytes = self.total_bytes
+        if total_bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total_bytes -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Close the cache database, keeping the cached results on disk."""
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached results in bytes."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()[0]
+
+
+def get_expression_ttl(expression: dict) -> tuple[str, float]:
+    """Get the call type and time to live of a getInfo result.
+
+    Long time to live values only apply when every loaded asset is in the
+    public data catalog.
+
+    Args:
+        expression : The serialized Earth Engine expression.
+
+    Returns:
+        tuple[str, float] : The function name of the result node and its time to live in seconds.
+    """
+    values = expression.get("values", {})
+    result = values.get(expression.get("result"), {})
+    call_type = result.get("functionInvocationValue", {}).get("functionName")
+    ttl = GETINFO_TTL.get(call_type, DEFAULT_TTL)
+
+    # Results that only depend on date ranges that ended long ago can be kept
+    # as long as archived metadata.
+    end_dates = []
+    asset_ids = []
+
+    def find_dates_and_assets(value):
+        if isinstance(value, dict):
+            invocation = value.get("functionInvocationValue", {})
+            function_name = invocation.get("functionName", "")
+            if function_name.endswith((".load", ".loadTable")):
+                arguments = invocation.get("arguments", {})
+                asset = arguments.get("id", arguments.get("tableId", {}))
+                asset_ids.append(asset.get("constantValue"))
+            if invocation.get("functionName") == "DateRange":
+                end = invocation.get("arguments", {}).get("end", {})
+                date = end.get("functionInvocationValue", {})
+                end_dates.append(
+                    date.get("arguments", {}).get("value", {}).get("constantValue")
+                    if date.get("functionName") == "Date"
+                    else end.get("constantValue")
+                )
+            for v in value.values():
+                find_dates_and_assets(v)
+        elif isinstance(value, list):
+            for v in value:
+                find_dates_and_assets(v)
+
+    find_dates_and_assets(values)
+    if not all(is_public_asset(asset_id) for asset_id in asset_ids):
+        return call_type, DEFAULT_TTL
+    if end_dates:
+        archive_date = datetime.datetime.now(datetime.timezone.utc) - (
+            datetime.timedelta(seconds=ARCHIVE_DELAY)
+        )
+        archived = True
+        for end_date in end_dates:
+            if isinstance(end_date, str):
+                try:
+                    end_date = datetime.datetime.fromisoformat(end_date)
+                except ValueError:
+                    end_date = None
+            elif isinstance(end_date, (int, float)) and not isinstance(end_date, bool):
+                end_date = datetime.datetime.fromtimestamp(
+                    end_date / 1000, tz=datetime.timezone.utc
+                )
+            else:
+                end_date = None
+            if end_date is not None and end_date.tzinfo is None:
+                end_date = end_date.replace(tzinfo=datetime.timezone.utc)
+            if end_date is None or end_date > archive_date:
+                archived = False
+                break
+        if archived:
+            ttl = max(ttl, ARCHIVE_TTL)
+
+    return call_type, ttl
+
+
+def is_public_asset(asset_id: str) -> bool:
+    """Check if an asset ID belongs to the public Earth Engine data catalog.
+
+    Args:
+        asset_id : ID of the loaded asset, or None if it is computed.
+
+    Returns:
+        bool : True if the asset is in the public data catalog.
+    """
+    if not isinstance(asset_id, str):
+        return False
+    if asset_id.startswith("projects/"):
+        return asset_id.startswith("projects/earthengine-public/")
+    return not asset_id.startswith("users/")
+
+
+def get_cached_info(ee_object: "ee.ComputedObject") -> tuple[bool, object]:
+    """Look up the cached value of an Earth Engine object.
+
+    Args:
+        ee_object : The Earth Engine object.
+
+    Returns:
+        tuple[bool, object] : Whether the value is cached, and the value.
+    """
+    cache = _getinfo_cache
+    if cache is None:
+        return False, None
+    return cache.get(get_cache_key(ee_object.serialize()))
+
+
+def put_cached_info(ee_object: "ee.ComputedObject", value: object) -> None:
+    """Store the evaluated value of an Earth Engine object in the cache.
+
+    Args:
+        ee_object : The Earth Engine object.
+        value : The value returned by getInfo.
+    """
+    cache = _getinfo_cache
+    if cache is None:
+        return
+    serialized = ee_object.serialize()
+    call_type, ttl = get_expression_ttl(json.loads(serialized))
+    cache.put(get_cache_key(serialized), call_type, value, ttl)
+
+
+def get_cache_key(serialized: str) -> str:
+    """Get the cache key of a serialized Earth Engine expression.
+
+    Args:
+        serialized : The serialized expression.
+
+    Returns:
+        str : The SHA-256 hash of the expression.
+    """
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def get_info(ee_object: "ee.ComputedObject", bypass: bool = False) -> object:
+    """Get the value of an Earth Engine object, reusing cached results.
+
+    Results are cached only when the getInfo cache is started.
+
+    Args:
+        ee_object : The Earth Engine object to evaluate.
+        bypass : Whether to skip the cache and always evaluate the object. Defaults to False.
+
+    Returns:
+        object : The value of the object, as returned by getInfo.
+    """
+    if bypass:
+        return ee_object.getInfo()
+
+    found, value = get_cached_info(ee_object)
+    if found:
+        return value
+
+    value = ee_object.getInfo()
+    put_cached_info(ee_object, value)
+    return value
+
+
+def start_getinfo_cache(db_path: str = None, max_cache_mb: int = 64) -> GetInfoCache:
+    """Start the persistent getInfo cache, replacing an open one.
+
+    Args:
+        db_path : Path to the cache database. Defaults to a file in the temp directory.
+        max_cache_mb : Maximum size of the cached results in MB. Defaults to 64.
+
+    Returns:
+        GetInfoCache : The open getInfo cache.
+    """
+    global _getinfo_cache
+
+    stop_getinfo_cache()
+    if db_path is None:
+        db_path = pathlib.Path(tempfile.gettempdir()) / "arcgee_getinfo.sqlite"
+    _getinfo_cache = GetInfoCache(db_path, int(max_cache_mb) * 1024 * 1024)
+    return _getinfo_cache
+
+
+def get_getinfo_cache() -> "GetInfoCache | None":
+    """Get the open getInfo cache.
+
+    Returns:
+        GetInfoCache | None : The open getInfo cache, or None if it is not started.
+    """
+    return _getinfo_cache
+
+
+def stop_getinfo_cache() -> None:
+    """Stop using the getInfo cache, keeping the cached results on disk."""
+    global _getinfo_cache
+
+    if _getinfo_cache is not None:
+        _getinfo_cache.close()
+        _getinfo_cache = None
+
+
+def report_getinfo_cache_stats(reset: bool = True) -> None:
+    """Add a tool message with the getInfo cache hit rate.
+
+    Args:
+        reset : Whether to reset the counters, so the next report only covers later calls. Defaults to True.
+    """
+    cache = _getinfo_cache
+    if cache is None:
+        return
+    requests_total = cache.hits + cache.misses
+    if requests_total:
+        arcpy.AddMessage(
+            f"getInfo cache: {cache.hits} hits, {cache.misses} misses "
+            f"({cache.hits / requests_total:.0%} hit rate)."
+        )
+    if reset:
+        cache.hits = 0
+        cache.misses = 0
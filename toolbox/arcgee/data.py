@@ -12,11 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
+import copy
+import csv
 import datetime
+import hashlib
+import io
+import itertools
 import json
+import multiprocessing
 import os
 import re
 import pathlib
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from types import ModuleType
 
 import numpy as np
@@ -27,11 +42,76 @@ import google.auth
 
 import arcpy  # type: ignore
 import ee
+from . import cache
+from . import raster
 from . import map as arcgee_map
 
 
 __version__ = "1.0.0"
 
+# Centroid and bounds of Earth Engine objects keyed by expression hash.
+_object_extent_cache: dict = {}
+
+# Deserialized saved objects and their derived metadata keyed by file path,
+# modification time and size.
+_saved_object_cache: dict = {}
+_saved_metadata_cache: dict = {}
+
+# Earth Engine objects published in memory, keyed by handle name, with a
+# version number that changes whenever a handle is published again.
+OBJECT_HANDLE_PREFIX = "memory://"
+_object_registry: dict = {}
+_object_registry_version = 0
+
+# Header of the compact format for saved objects: magic bytes, format version
+# and the SHA-1 digest of the serialized expression, followed by the
+# zlib-compressed expression.
+COMPACT_MAGIC = b"ARCGEE"
+COMPACT_VERSION = 1
+
+# Fonts used for GIF labels keyed by font path and size, and the lock held
+# while GIF frames are decoded with a different Pillow loading strategy.
+_font_cache: dict = {}
+_gif_loading_lock = threading.Lock()
+
+# Types of Earth Engine assets known to exist, keyed by asset name, and the
+# lock held while missing asset folders and collections are created.
+_verified_assets: dict = {}
+_asset_path_lock = threading.Lock()
+
+# Flat listings of Google Cloud Storage buckets keyed by bucket name, shared
+# by the folder and file pickers, and the age in seconds after which a
+# listing is refreshed in the background.
+_bucket_listings: dict = {}
+_bucket_listing_lock = threading.Lock()
+BUCKET_LISTING_TTL = 5 * 60
+
+# Landsat Collection 2 surface reflectance collections with their operating
+# dates (end is None for active sensors) and bands keyed by common band name.
+_ETM_BANDS = {
+    "Blue": "SR_B1",
+    "Green": "SR_B2",
+    "Red": "SR_B3",
+    "NIR": "SR_B4",
+    "SWIR1": "SR_B5",
+    "SWIR2": "SR_B7",
+}
+_OLI_BANDS = {
+    "Blue": "SR_B2",
+    "Green": "SR_B3",
+    "Red": "SR_B4",
+    "NIR": "SR_B5",
+    "SWIR1": "SR_B6",
+    "SWIR2": "SR_B7",
+}
+LANDSAT_SENSORS = [
+    ("LANDSAT/LC09/C02/T1_L2", "2021-10-31", None, _OLI_BANDS),
+    ("LANDSAT/LC08/C02/T1_L2", "2013-03-18", None, _OLI_BANDS),
+    ("LANDSAT/LE07/C02/T1_L2", "1999-05-28", "2024-01-20", _ETM_BANDS),
+    ("LANDSAT/LT05/C02/T1_L2", "1984-03-16", "2012-05-06", _ETM_BANDS),
+    ("LANDSAT/LT04/C02/T1_L2", "1982-08-22", "1993-12-15", _ETM_BANDS),
+]
+
 
 def is_valid_workload_tag(tag: str) -> bool:
     """
@@ -87,26 +167,213 @@ def auth(project: str = None) -> None:
     return
 
 
-def save_ee_result(ee_object: "ee.ComputedObject", path: str) -> None:
+def get_expression_hash(ee_object: "ee.ComputedObject") -> str:
+    """
+    Get a hash of the serialized Earth Engine expression.
+
+    Args:
+        ee_object : The Earth Engine object to hash.
+
+    Returns:
+        str : The SHA-1 hex digest of the serialized expression.
+    """
+    return hashlib.sha1(ee_object.serialize().encode("utf-8")).hexdigest()
+
+
+def is_object_handle(path: str) -> bool:
+    """
+    Check if a path is a handle of an object published in memory.
+
+    Args:
+        path : The file path or handle to check.
+
+    Returns:
+        bool : True if the path is an object handle, False otherwise.
+    """
+    return bool(path) and str(path).startswith(OBJECT_HANDLE_PREFIX)
+
+
+def get_handle_name(handle: str) -> str:
+    """
+    Get the registry name of an object handle.
+
+    The .json suffix that tools append to output file names is ignored, so
+    memory://name and memory://name.json refer to the same object.
+
+    Args:
+        handle : The object handle, such as memory://filtered.
+
+    Returns:
+        str : The name of the object in the registry.
+    """
+    name = str(handle)[len(OBJECT_HANDLE_PREFIX) :]
+    if name.endswith(".json"):
+        name = name[: -len(".json")]
+    return name
+
+
+def register_ee_object(ee_object: "ee.ComputedObject", handle: str) -> str:
+    """
+    Publish an Earth Engine object in memory under a handle.
+
+    Tools that load serialized objects accept the handle in place of a JSON
+    file, so chained tools do not serialize the object to disk at every step.
+
+    Args:
+        ee_object : The Earth Engine object to publish.
+        handle : The object handle, such as memory://filtered, or just its name.
+
+    Returns:
+        str : The object handle.
+    """
+    global _object_registry_version
+
+    if not is_object_handle(handle):
+        handle = OBJECT_HANDLE_PREFIX + handle
+    _object_registry_version += 1
+    _object_registry[get_handle_name(handle)] = (_object_registry_version, ee_object)
+    arcpy.AddMessage(f"Published the Earth Engine object in memory as {handle}")
+
+    return handle
+
+
+def get_registered_object(handle: str) -> tuple[int, "ee.ComputedObject"]:
+    """
+    Get an Earth Engine object published in memory.
+
+    Args:
+        handle : The object handle.
+
+    Returns:
+        tuple : The version number and the Earth Engine object.
+
+    Raises:
+        KeyError: If no object is published under the handle.
+    """
+    name = get_handle_name(handle)
+    if name not in _object_registry:
+        raise KeyError(
+            f"No Earth Engine object is published as {OBJECT_HANDLE_PREFIX}{name} "
+            "in this session."
+        )
+    return _object_registry[name]
+
+
+def persist_ee_object(handle: str, path: str, compact: bool = False) -> None:
+    """
+    Save an Earth Engine object published in memory to a file.
+
+    Args:
+        handle : The object handle.
+        path : The file path to save the Earth Engine object.
+        compact : Whether to save in the compact format. Defaults to False.
+    """
+    save_ee_result(get_registered_object(handle)[1], path, compact)
+
+
+def clear_object_registry() -> None:
+    """Remove all Earth Engine objects published in memory."""
+    _object_registry.clear()
+
+
+def save_ee_result(
+    ee_object: "ee.ComputedObject", path: str, compact: bool = False
+) -> None:
     """
     Save an Earth Engine object to a JSON file.
 
+    If path is an object handle such as memory://name, the object is published
+    in memory instead of being written to disk.
+
     Args:
         ee_object : The Earth Engine object to save.
-        path : The file path to save the Earth Engine object.
+        path : The file path or object handle to save the Earth Engine object.
+        compact : Whether to save in the compact format, a zlib-compressed expression with a versioned header and content hash. Defaults to False.
     """
+    # Fold chained filters so the saved graph is smaller for later tools.
+    ee_object = optimize_expression(ee_object, verbose=not is_object_handle(path))
+
+    if is_object_handle(path):
+        register_ee_object(ee_object, path)
+        return
+
     serialized_obj = ee_object.serialize()
 
+    if compact:
+        serialized_bytes = serialized_obj.encode("utf-8")
+        pathlib.Path(path).write_bytes(
+            COMPACT_MAGIC
+            + bytes([COMPACT_VERSION])
+            + hashlib.sha1(serialized_bytes).digest()
+            + zlib.compress(serialized_bytes)
+        )
+        return
+
     pathlib.Path(path).write_text(ujson.dumps(serialized_obj))
     return
 
 
+def read_ee_result(path: str) -> str:
+    """
+    Read the serialized Earth Engine expression from a saved file.
+
+    Files in the compact format are detected by their header; any other file
+    is read as JSON.
+
+    Args:
+        path : The file path to the saved Earth Engine object.
+
+    Returns:
+        str: The serialized Earth Engine expression.
+
+    Raises:
+        ValueError: If a compact file has an unsupported version or its content hash does not match.
+    """
+    content = pathlib.Path(path).read_bytes()
+    if not content.startswith(COMPACT_MAGIC):
+        return ujson.loads(content)
+
+    version = content[len(COMPACT_MAGIC)]
+    if version != COMPACT_VERSION:
+        raise ValueError(f"Unsupported compact format version {version}.")
+    digest_start = len(COMPACT_MAGIC) + 1
+    digest_end = digest_start + hashlib.sha1().digest_size
+    serialized_bytes = zlib.decompress(content[digest_end:])
+    if hashlib.sha1(serialized_bytes).digest() != content[digest_start:digest_end]:
+        raise ValueError("The content hash does not match; the file is corrupted.")
+
+    return serialized_bytes.decode("utf-8")
+
+
+def get_saved_object_key(path: str) -> tuple:
+    """
+    Get the cache key of a saved Earth Engine object file.
+
+    Args:
+        path : The file path to the saved Earth Engine object.
+
+    Returns:
+        tuple: The resolved path, modification time and size of the file, or the handle name and version of an object published in memory.
+    """
+    if is_object_handle(path):
+        return (get_handle_name(path), get_registered_object(path)[0], 0)
+
+    path = pathlib.Path(path).resolve()
+    stat = path.stat()
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
 def load_ee_result(path: str) -> "ee.ComputedObject":
     """
     Loads a serialized Earth Engine object from a JSON file and deserializes it.
 
+    Both JSON files and files saved in the compact format are supported.
+    Deserialized objects are cached per process by file path, modification
+    time and size, so repeated loads of an unchanged file are free. Object
+    handles such as memory://name return the object published in memory.
+
     Args:
-        path : The file path to the JSON file.
+        path : The file path to the JSON file, or an object handle.
 
     Returns:
         ee.ComputedObject: The deserialized Earth Engine object.
@@ -114,11 +381,18 @@ def load_ee_result(path: str) -> "ee.ComputedObject":
     Raises:
         RuntimeError: If deserialization fails.
     """
+    if is_object_handle(path):
+        return get_registered_object(path)[1]
+
     try:
-        ee_object = ujson.loads(pathlib.Path(path).read_text())
+        key = get_saved_object_key(path)
+        if key in _saved_object_cache:
+            return _saved_object_cache[key]
+
+        ee_object = read_ee_result(path)
 
         # Attempt to deserialize the Earth Engine object.
-        return ee.deserializer.fromJSON(ee_object)
+        ee_object = ee.deserializer.fromJSON(ee_object)
 
     except Exception as e:
         # Log an error message and raise a RuntimeError.
@@ -127,6 +401,39 @@ def load_ee_result(path: str) -> "ee.ComputedObject":
         )
         raise RuntimeError(error_message) from e
 
+    # Drop entries of earlier versions of the file.
+    for stale_key in [k for k in _saved_object_cache if k[0] == key[0]]:
+        del _saved_object_cache[stale_key]
+    _saved_object_cache[key] = ee_object
+
+    return ee_object
+
+
+def get_saved_object_metadata(path: str, name: str, compute) -> object:
+    """
+    Get metadata derived from a saved Earth Engine object, computing it once.
+
+    The value is cached per process with the file path, modification time and
+    size, so validation passes on an unchanged file do not call the server.
+
+    Args:
+        path : The file path to the saved Earth Engine object.
+        name : The name of the metadata, unique for each compute function and its arguments.
+        compute : A function that takes the loaded Earth Engine object and returns the metadata.
+
+    Returns:
+        object: The metadata returned by compute.
+    """
+    key = get_saved_object_key(path) + (name,)
+    if key not in _saved_metadata_cache:
+        for stale_key in [
+            k for k in _saved_metadata_cache if k[0] == key[0] and k[1:3] != key[1:3]
+        ]:
+            del _saved_metadata_cache[stale_key]
+        _saved_metadata_cache[key] = compute(load_ee_result(path))
+
+    return _saved_metadata_cache[key]
+
 
 def get_reducer_list() -> list[str]:
     """
@@ -336,6 +643,233 @@ def filter_by_date(
     return collection
 
 
+def get_function_name(node: "ee.ComputedObject") -> str:
+    """
+    Get the name of the Earth Engine function that computes an object.
+
+    Args:
+        node : The Earth Engine object.
+
+    Returns:
+        str : The function name, such as 'Collection.filter', or None for constants, variables and custom functions.
+    """
+    func = getattr(node, "func", None)
+    if func is None or getattr(node, "args", None) is None:
+        return None
+    try:
+        return func.getSignature().get("name")
+    except Exception:
+        return None
+
+
+def get_constant_date(date: "ee.Date | str | int") -> datetime.datetime:
+    """
+    Get the value of a date that is a constant in the expression.
+
+    Args:
+        date : A date string, milliseconds since the epoch, or an ee.Date built from either.
+
+    Returns:
+        datetime.datetime : The date, or None if it is not a constant.
+    """
+    if get_function_name(date) == "Date" and set(date.args) == {"value"}:
+        date = date.args["value"]
+    try:
+        if isinstance(date, str):
+            parsed = datetime.datetime.fromisoformat(date)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+            return parsed
+        if isinstance(date, (int, float)) and not isinstance(date, bool):
+            return datetime.datetime.fromtimestamp(
+                date / 1000, tz=datetime.timezone.utc
+            )
+    except (ValueError, OverflowError, OSError):
+        pass
+    return None
+
+
+def merge_filters(filters: list["ee.Filter"]) -> "ee.Filter":
+    """
+    Merge filters into a single filter that keeps the same elements.
+
+    Nested ee.Filter.and filters are flattened, duplicate filters are dropped,
+    and date range filters on system:time_start with constant dates are
+    intersected into one date range.
+
+    Args:
+        filters : The filters, all of which must pass.
+
+    Returns:
+        ee.Filter : The merged filter.
+    """
+    flat = []
+    for item in filters:
+        if get_function_name(item) == "Filter.and":
+            flat.extend(item.args["filters"])
+        else:
+            flat.append(item)
+
+    # Intersect constant date ranges.
+    date_filters = []
+    other_filters = []
+    for item in flat:
+        field = item.args.get("rightField") if get_function_name(item) else None
+        if isinstance(field, ee.String):
+            field = field.encode()
+        if (
+            get_function_name(item) == "Filter.dateRangeContains"
+            and field == "system:time_start"
+            and get_function_name(item.args.get("leftValue")) == "DateRange"
+        ):
+            date_range = item.args["leftValue"].args
+            start = date_range.get("start")
+            end = date_range.get("end")
+            if get_constant_date(start) and get_constant_date(end):
+                date_filters.append((start, end))
+                continue
+        other_filters.append(item)
+    if len(date_filters) > 1:
+        start = max(date_filters, key=lambda d: get_constant_date(d[0]))[0]
+        end = min(date_filters, key=lambda d: get_constant_date(d[1]))[1]
+        # An empty intersection cannot be expressed as a date range.
+        if get_constant_date(start) < get_constant_date(end):
+            date_filters = [(start, end)]
+    flat = [ee.Filter.date(start, end) for start, end in date_filters] + other_filters
+
+    # Remove duplicate filters, such as repeated filterBounds calls.
+    unique = {}
+    for item in flat:
+        unique.setdefault(item.serialize(), item)
+    flat = list(unique.values())
+
+    if len(flat) == 1:
+        return flat[0]
+    return ee.Filter.And(*flat)
+
+
+def count_expression_nodes(ee_object: "ee.ComputedObject") -> int:
+    """
+    Count the function invocations in the serialized expression of an object.
+
+    Args:
+        ee_object : The Earth Engine object.
+
+    Returns:
+        int : The number of function invocation nodes.
+    """
+
+    def count(value):
+        if isinstance(value, dict):
+            return ("functionInvocationValue" in value) + sum(
+                count(v) for v in value.values()
+            )
+        if isinstance(value, list):
+            return sum(count(v) for v in value)
+        return 0
+
+    return count(json.loads(ee_object.serialize()))
+
+
+def optimize_expression(
+    ee_object: "ee.ComputedObject", verbose: bool = False
+) -> "ee.ComputedObject":
+    """
+    Simplify the expression graph of an Earth Engine object before serialization.
+
+    Chains of consecutive Collection.filter calls, from filter, filterDate,
+    filterBounds or filter_by_properties, are folded into one filter call
+    with merge_filters. Filters given as strings are not folded. The rest of the graph is kept as is, and nodes that
+    are shared stay shared.
+
+    Args:
+        ee_object : The Earth Engine object to optimize.
+        verbose : Whether to report the node counts before and after. Defaults to False.
+
+    Returns:
+        ee.ComputedObject : An equivalent Earth Engine object of the same type.
+    """
+    optimized = {}
+
+    def optimize(value):
+        if isinstance(value, list):
+            return [optimize(v) for v in value]
+        if isinstance(value, dict):
+            return {k: optimize(v) for k, v in value.items()}
+        if get_function_name(value) is None:
+            return value
+        if id(value) in optimized:
+            return optimized[id(value)][1]
+
+        if get_function_name(value) == "Collection.filter":
+            filters = []
+            base = value
+            while get_function_name(base) == "Collection.filter":
+                filters.append(base.args["filter"])
+                base = base.args["collection"]
+            filters = filters[::-1]
+            # Filters given as strings, such as those of filter_by_properties,
+            # are kept as their own filter calls around the merged filter.
+            ee_filters = [item for item in filters if isinstance(item, ee.Filter)]
+            other_filters = [
+                item for item in filters if not isinstance(item, ee.Filter)
+            ]
+            collection = optimize(base)
+            inner_filters = []
+            if ee_filters:
+                inner_filters.append(merge_filters(ee_filters))
+            inner_filters += other_filters
+            for item in inner_filters[:-1]:
+                inner = copy.copy(value)
+                inner.args = {"collection": collection, "filter": item}
+                collection = inner
+            new_args = {"collection": collection, "filter": inner_filters[-1]}
+        else:
+            new_args = optimize(value.args)
+
+        # Copy the node to keep its type, such as ee.ImageCollection.
+        node = copy.copy(value)
+        node.args = new_args
+        # Keep the source object alive so its id is not reused.
+        optimized[id(value)] = (value, node)
+        return node
+
+    result = optimize(ee_object)
+
+    if verbose:
+        arcpy.AddMessage(
+            f"Expression nodes: {count_expression_nodes(ee_object)} before "
+            f"optimization, {count_expression_nodes(result)} after"
+        )
+
+    return result
+
+
+def get_label_font(font_path: str = None, font_size: int = 40):
+    """
+    Load a font for GIF labels, reusing previously loaded fonts.
+
+    Args:
+        font_path : Path to a font file. Defaults to Arial, or Pillow's default font if Arial is unavailable.
+        font_size : Font size for the label text.
+
+    Returns:
+        PIL.ImageFont.FreeTypeFont: The loaded font.
+    """
+    from PIL import ImageFont
+
+    key = (font_path, font_size)
+    if key not in _font_cache:
+        try:
+            _font_cache[key] = ImageFont.truetype(font_path or "arial.ttf", font_size)
+        except OSError:
+            if font_path:
+                raise
+            _font_cache[key] = ImageFont.load_default(font_size)
+
+    return _font_cache[key]
+
+
 def add_date_to_gif(
     input_gif: str,
     output_gif: str,
@@ -348,6 +882,12 @@ def add_date_to_gif(
     """
     Adds a date label to each frame of a GIF.
 
+    Each label is rendered once as a small mask and pasted onto the frames in
+    palette mode, so frames are not converted to RGBA and the output keeps the
+    input colors exactly. Consecutive identical frames are merged.
+    The output is written to a temporary file first, so output_gif may be the
+    same path as input_gif.
+
     Args:
         input_gif : Path to the input GIF file.
         output_gif : Path to save the output GIF file.
@@ -357,38 +897,105 @@ def add_date_to_gif(
         position : (x, y) pixel coordinates for the date label.
         color : Color of the text. Defaults to white.
     """
-    from PIL import Image, ImageDraw, ImageFont, ImageSequence
-
-    # Open the input GIF.
-    gif = Image.open(input_gif)
-
-    # Load the font (use a default font if no font_path is provided).
-    font = ImageFont.truetype(font_path or "arial.ttf", font_size)
-
-    frames = []
-    for i, frame in enumerate(ImageSequence.Iterator(gif)):
-        # Ensure the number of dates matches the frames.
-        if i >= len(dates):
-            break
-
-        # Copy the frame to edit.
-        frame = frame.convert("RGBA")
-        draw = ImageDraw.Draw(frame)
-
-        # Add the date text.
-        draw.text(position, dates[i], font=font, fill=color)
-
-        # Append the edited frame.
-        frames.append(frame)
-
-    # Save the frames as a new GIF.
-    frames[0].save(
-        output_gif,
-        save_all=True,
-        append_images=frames[1:],
-        loop=gif.info.get("loop", 0),
-        duration=gif.info.get("duration", 100),
-    )
+    from PIL import GifImagePlugin, Image, ImageColor, ImageDraw, ImageSequence
+
+    font = get_label_font(font_path, font_size)
+    rgb = ImageColor.getrgb(color)[:3]
+
+    # Render each distinct label once as a 1-bit mask.
+    label_masks = {}
+
+    def get_label_mask(text):
+        if text not in label_masks:
+            left, top, right, bottom = font.getbbox(text)
+            mask = Image.new("L", (right, bottom))
+            ImageDraw.Draw(mask).text((0, 0), text, font=font, fill=255)
+            label_masks[text] = mask.point(lambda v: 255 if v >= 128 else 0, "1")
+        return label_masks[text]
+
+    # Find the palette entry closest to the label color, once per palette.
+    palette_fills = {}
+
+    def get_palette_index(frame):
+        palette = bytes(frame.getpalette() or [])
+        if palette not in palette_fills:
+            entries = np.frombuffer(palette, dtype=np.uint8).reshape(-1, 3)
+            distance = ((entries.astype(int) - rgb) ** 2).sum(axis=1)
+            palette_fills[palette] = int(distance.argmin())
+        return palette_fills[palette]
+
+    def to_palette(frame):
+        # Frames with their own palette are decoded as RGB. Map them back onto
+        # an exact palette of their colors rather than letting the GIF writer
+        # run its much slower, lossy median cut quantizer.
+        colors = frame.getcolors(256)
+        if colors is None:
+            return frame.quantize(
+                method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE
+            )
+        palette_image = Image.new("P", (1, 1))
+        palette_image.putpalette([c for _, color in colors for c in color])
+        return frame.quantize(palette=palette_image, dither=Image.Dither.NONE)
+
+    output_gif = pathlib.Path(output_gif)
+    temp_gif = output_gif.with_name(output_gif.stem + ".tmp.gif")
+
+    # Keep later frames in palette mode when they share the first palette.
+    # The strategy is a Pillow module setting read while each frame is
+    # decoded, so hold the lock until all frames are written and restore it.
+    with _gif_loading_lock:
+        loading_strategy = GifImagePlugin.LOADING_STRATEGY
+        GifImagePlugin.LOADING_STRATEGY = (
+            GifImagePlugin.LoadingStrategy.RGB_AFTER_DIFFERENT_PALETTE_ONLY
+        )
+        try:
+            with Image.open(input_gif) as gif:
+                default_duration = gif.info.get("duration", 100)
+                loop = gif.info.get("loop", 0)
+
+                def annotated_frames():
+                    # Hold one frame back to merge identical consecutive frames.
+                    pending = None
+                    for i, frame in enumerate(ImageSequence.Iterator(gif)):
+                        # Ensure the number of dates matches the frames.
+                        if i >= len(dates):
+                            break
+                        duration = frame.info.get("duration", default_duration)
+                        label = get_label_mask(dates[i])
+                        if frame.mode == "P":
+                            frame = frame.copy()
+                            frame.paste(get_palette_index(frame), position, label)
+                        else:
+                            frame = frame.convert("RGB")
+                            frame.paste(rgb, position, label)
+                            frame = to_palette(frame)
+                        if (
+                            pending is not None
+                            and frame.getpalette() == pending.getpalette()
+                            and frame.tobytes() == pending.tobytes()
+                        ):
+                            pending.info["duration"] += duration
+                            continue
+                        if pending is not None:
+                            yield pending
+                        frame.info["duration"] = duration
+                        pending = frame
+                    if pending is not None:
+                        yield pending
+
+                frames = annotated_frames()
+                first = next(frames)
+                first.save(
+                    temp_gif,
+                    save_all=True,
+                    append_images=frames,
+                    loop=loop,
+                    optimize=True,
+                )
+        finally:
+            GifImagePlugin.LOADING_STRATEGY = loading_strategy
+
+    os.replace(temp_gif, output_gif)
 
 
 def validate_date(date_str: str, date_format: str = "%Y-%m-%d") -> None:
@@ -417,6 +1024,85 @@ def validate_date(date_str: str, date_format: str = "%Y-%m-%d") -> None:
         raise  # Re-raise the error to stop execution.
 
 
+def download_url_to_file(
+    url: str,
+    out_file: str,
+    timeout: int = 300,
+    proxies: dict = None,
+    chunk_size: int = 1024 * 1024,
+    max_retries: int = 5,
+    backoff: float = 2.0,
+) -> None:
+    """Streams a URL to a file, retrying transient failures.
+
+    The response is written in chunks to a temporary file next to the output
+    and renamed into place once complete, so memory use does not depend on the
+    file size and a failed download never leaves a partial output. When a retry
+    happens after some bytes were written, the download resumes with an HTTP
+    Range request if the server supports it.
+
+    Args:
+        url : The URL to download.
+        out_file : File path to the output file.
+        timeout : The number of seconds the request will be timed out. Defaults to 300.
+        proxies : A dictionary of proxy servers to use. Defaults to None.
+        chunk_size : The number of bytes written per chunk. Defaults to 1 MB.
+        max_retries : The maximum number of retries on transient failures. Defaults to 5.
+        backoff : The base delay in seconds between retries, doubled after each retry. Defaults to 2.
+
+    Raises:
+        RuntimeError: If the server returns a non-retryable error or all retries fail.
+    """
+    out_file = pathlib.Path(out_file)
+    part_file = out_file.with_name(out_file.name + ".part")
+    if part_file.exists():
+        part_file.unlink()
+
+    for attempt in range(max_retries + 1):
+        offset = part_file.stat().st_size if part_file.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        try:
+            with requests.get(
+                url, stream=True, timeout=timeout, proxies=proxies, headers=headers
+            ) as r:
+                if r.status_code == 429 or r.status_code >= 500:
+                    raise requests.HTTPError(f"HTTP {r.status_code}", response=r)
+                if r.status_code not in (200, 206):
+                    try:
+                        message = r.json()["error"]["message"]
+                    except Exception:
+                        message = r.text
+                    raise RuntimeError(
+                        f"An error occurred while downloading: {message}"
+                    )
+                # Restart from the beginning if the server ignored the range.
+                mode = "ab" if r.status_code == 206 else "wb"
+                with open(part_file, mode) as f:
+                    for chunk in r.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+            os.replace(part_file, out_file)
+            return
+        except (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.HTTPError,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:
+            if attempt == max_retries:
+                if part_file.exists():
+                    part_file.unlink()
+                raise RuntimeError(
+                    f"Download failed after {max_retries + 1} attempts: {e}"
+                ) from e
+            delay = backoff * 2**attempt
+            arcpy.AddWarning(f"Download interrupted ({e}). Retrying in {delay:g} s ...")
+            time.sleep(delay)
+        except Exception:
+            if part_file.exists():
+                part_file.unlink()
+            raise
+
+
 def download_ee_video(
     collection: "ee.ImageCollection",
     video_args: dict,
@@ -436,7 +1122,7 @@ def download_ee_video(
 
     out_gif = pathlib.Path(out_gif).resolve()
     if not out_gif.suffix == ".gif":
-        print("The output file must have an extension of .gif.")
+        arcpy.AddError("The output file must have an extension of .gif.")
         return
 
     if not out_gif.parent.exists():
@@ -449,8 +1135,8 @@ def download_ee_video(
             try:
                 roi = roi.geometry()
             except Exception as e:
-                print("Could not convert the provided roi to ee.Geometry")
-                print(e)
+                arcpy.AddError("Could not convert the provided roi to ee.Geometry")
+                arcpy.AddError(e)
                 return
 
         video_args["region"] = roi
@@ -458,84 +1144,271 @@ def download_ee_video(
         video_args["dimensions"] = 768
 
     try:
-        print("Generating URL...")
+        arcpy.AddMessage("Generating URL...")
         url = collection.getVideoThumbURL(video_args)
 
-        print(f"Downloading GIF image from {url}\nPlease wait ...")
-        r = requests.get(url, stream=True, timeout=timeout, proxies=proxies)
-
-        if r.status_code != 200:
-            print("An error occurred while downloading.")
-            print(r.json()["error"]["message"])
-            return
-        else:
-            out_gif.write_bytes(b"".join(r.iter_content(chunk_size=1024)))
-            print(f"The GIF image has been saved to: {out_gif}")
+        arcpy.AddMessage(f"Downloading GIF image from {url}\nPlease wait ...")
+        download_url_to_file(url, str(out_gif), timeout=timeout, proxies=proxies)
+        arcpy.AddMessage(f"The GIF image has been saved to: {out_gif}")
     except Exception as e:
-        print(e)
+        arcpy.AddError(e)
 
 
-def date_sequence(
-    start: str,
-    end: str,
-    unit: str,
-    date_format: str = "YYYY-MM-dd",
-    step: int = 1,
-) -> "ee.List":
-    """Creates a date sequence.
+def get_frame_thumb_args(video_args: dict) -> dict:
+    """Convert video thumbnail parameters to per-frame thumbnail parameters.
 
     Args:
-        start : The start date, e.g., '2000-01-01'.
-        end : The end date, e.g., '2000-12-31'.
-        unit : One of 'year', 'quarter', 'month' 'week', 'day', 'hour', 'minute', or 'second'.
-        date_format : A pattern, as described at http://joda-time.sourceforge.net/apidocs/org/joda/time/format/DateTimeFormat.html. Defaults to 'YYYY-MM-dd'.
-        step : The step size. Defaults to 1.
+        video_args : Parameters for the video thumbnail.
 
     Returns:
-        ee.List: A list of date sequence.
+        dict: Parameters for ee.Image.getThumbURL, rendering PNG frames.
     """
+    thumb_args = {
+        key: value
+        for key, value in video_args.items()
+        if key not in ("framesPerSecond", "format")
+    }
+    thumb_args["format"] = "png"
+    if "dimensions" not in thumb_args:
+        thumb_args["dimensions"] = 768
 
-    def get_quarter(d):
-        return str((int(d[5:7]) - 1) // 3 * 3 + 1).zfill(2)
+    return thumb_args
 
-    def get_monday(d):
-        date_obj = datetime.datetime.strptime(d, "%Y-%m-%d")
-        start_of_week = date_obj - datetime.timedelta(days=date_obj.weekday())
-        return start_of_week.strftime("%Y-%m-%d")
 
-    if unit == "year":
-        start = start[:4] + "-01-01"
-    elif unit == "month":
-        start = start[:7] + "-01"
-    elif unit == "quarter":
-        start = start[:5] + get_quarter(start) + "-01"
-    elif unit == "week":
-        start = get_monday(start)
+def download_ee_frame(
+    image: "ee.Image", thumb_args: dict, timeout: int = 300, proxies: dict = None
+) -> bytes:
+    """Downloads a single image thumbnail from Earth Engine.
 
-    start_date = ee.Date(start)
-    end_date = ee.Date(end)
+    Args:
+        image : An ee.Image.
+        thumb_args : Parameters for the image thumbnail.
+        timeout : The number of seconds the request will be timed out. Defaults to 300.
+        proxies : A dictionary of proxy servers to use. Defaults to None.
 
-    if unit != "quarter":
-        count = ee.Number(end_date.difference(start_date, unit)).toInt()
-        num_seq = ee.List.sequence(0, count)
-        if step > 1:
-            num_seq = num_seq.slice(0, num_seq.size(), step)
-        date_seq = num_seq.map(
-            lambda d: start_date.advance(d, unit).format(date_format)
-        )
+    Returns:
+        bytes: The encoded thumbnail image.
+    """
+    url = image.getThumbURL(thumb_args)
+    r = requests.get(url, timeout=timeout, proxies=proxies)
+    if r.status_code != 200:
+        raise RuntimeError(f"Failed to download frame from {url}: {r.text}")
 
-    else:
-        unit = "month"
-        count = ee.Number(end_date.difference(start_date, unit)).divide(3).toInt()
-        num_seq = ee.List.sequence(0, count.multiply(3), 3)
-        date_seq = num_seq.map(
-            lambda d: start_date.advance(d, unit).format(date_format)
-        )
+    return r.content
 
-    return date_seq
 
+def iter_ee_frames(
+    collection: "ee.ImageCollection",
+    thumb_args: dict,
+    frame_count: int,
+    max_workers: int = 8,
+    chunk_size: int = 50,
+    timeout: int = 300,
+    proxies: dict = None,
+):
+    """Fetches the images of a collection as thumbnails concurrently, in order.
 
-def get_current_year() -> int:
+    Frames are requested in chunks of chunk_size images so that only one
+    chunk of URLs and encoded frames is held at a time.
+
+    Args:
+        collection : An ee.ImageCollection.
+        thumb_args : Parameters for the image thumbnails.
+        frame_count : The number of images to fetch from the collection.
+        max_workers : The maximum number of concurrent frame requests. Defaults to 8.
+        chunk_size : The number of frames fetched per chunk. Defaults to 50.
+        timeout : The number of seconds each request will be timed out. Defaults to 300.
+        proxies : A dictionary of proxy servers to use. Defaults to None.
+
+    Yields:
+        PIL.Image.Image: The decoded frames in collection order.
+    """
+    from PIL import Image
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for offset in range(0, frame_count, chunk_size):
+            count = min(chunk_size, frame_count - offset)
+            image_list = collection.toList(count, offset)
+            futures = [
+                executor.submit(
+                    download_ee_frame,
+                    ee.Image(image_list.get(i)),
+                    thumb_args,
+                    timeout,
+                    proxies,
+                )
+                for i in range(count)
+            ]
+            for future in futures:
+                frame = Image.open(io.BytesIO(future.result()))
+                frame.load()
+                yield frame
+            arcpy.AddMessage(
+                f"Downloaded frames {offset + 1}-{offset + count} of {frame_count}"
+            )
+
+
+def save_frames_to_video(frames, out_file: str, frames_per_second: int = 10) -> None:
+    """Assembles frames into an animated GIF, MP4 or WebM file.
+
+    Args:
+        frames : An iterable of PIL images.
+        out_file : File path to the output file, ending with .gif, .mp4 or .webm.
+        frames_per_second : Animation speed. Defaults to 10.
+    """
+    out_file = pathlib.Path(out_file)
+    suffix = out_file.suffix.lower()
+    frames = iter(frames)
+
+    if suffix == ".gif":
+        first = next(frames)
+        first.save(
+            out_file,
+            save_all=True,
+            append_images=frames,
+            duration=int(1000 / frames_per_second),
+            loop=0,
+            optimize=True,
+        )
+    elif suffix in (".mp4", ".webm"):
+        try:
+            import imageio.v2 as imageio
+        except ImportError:
+            arcpy.AddError(
+                "The imageio package (with imageio-ffmpeg) is required to "
+                "write MP4 or WebM files."
+            )
+            raise
+        with imageio.get_writer(str(out_file), fps=frames_per_second) as writer:
+            for frame in frames:
+                writer.append_data(np.asarray(frame.convert("RGB")))
+    else:
+        raise ValueError("The output file must end with .gif, .mp4 or .webm.")
+
+
+def download_ee_frames(
+    collection: "ee.ImageCollection",
+    video_args: dict,
+    out_file: str,
+    max_workers: int = 8,
+    chunk_size: int = 50,
+    timeout: int = 300,
+    proxies: dict = None,
+) -> str:
+    """Downloads an image collection frame by frame and assembles the animation locally.
+
+    Unlike download_ee_video, each frame is rendered as a separate thumbnail
+    request, so the animation is not bound by the video thumbnail limits on
+    frame count and size.
+
+    Args:
+        collection : An ee.ImageCollection.
+        video_args : Parameters for the video thumbnail, as for download_ee_video.
+        out_file : File path to the output file, ending with .gif, .mp4 or .webm.
+        max_workers : The maximum number of concurrent frame requests. Defaults to 8.
+        chunk_size : The number of frames fetched per chunk. Defaults to 50.
+        timeout : The number of seconds each request will be timed out. Defaults to 300.
+        proxies : A dictionary of proxy servers to use. Defaults to None.
+
+    Returns:
+        str: File path to the output file.
+    """
+    out_file = pathlib.Path(out_file).resolve()
+    if out_file.suffix.lower() not in (".gif", ".mp4", ".webm"):
+        arcpy.AddError("The output file must have an extension of .gif, .mp4 or .webm.")
+        return
+
+    if not out_file.parent.exists():
+        out_file.parent.mkdir(parents=True)
+
+    thumb_args = get_frame_thumb_args(video_args)
+    if "region" in thumb_args and not isinstance(thumb_args["region"], ee.Geometry):
+        thumb_args["region"] = thumb_args["region"].geometry()
+
+    frame_count = collection.size().getInfo()
+    if frame_count == 0:
+        arcpy.AddWarning("The image collection is empty. No frames to download.")
+        return
+
+    arcpy.AddMessage(
+        f"Downloading {frame_count} frames with {max_workers} concurrent requests ..."
+    )
+    frames = iter_ee_frames(
+        collection,
+        thumb_args,
+        frame_count,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+        timeout=timeout,
+        proxies=proxies,
+    )
+    save_frames_to_video(frames, str(out_file), video_args.get("framesPerSecond", 10))
+    arcpy.AddMessage(f"The animation has been saved to: {out_file}")
+
+    return str(out_file)
+
+
+def date_sequence(
+    start: str,
+    end: str,
+    unit: str,
+    date_format: str = "YYYY-MM-dd",
+    step: int = 1,
+) -> "ee.List":
+    """Creates a date sequence.
+
+    Args:
+        start : The start date, e.g., '2000-01-01'.
+        end : The end date, e.g., '2000-12-31'.
+        unit : One of 'year', 'quarter', 'month' 'week', 'day', 'hour', 'minute', or 'second'.
+        date_format : A pattern, as described at http://joda-time.sourceforge.net/apidocs/org/joda/time/format/DateTimeFormat.html. Defaults to 'YYYY-MM-dd'.
+        step : The step size. Defaults to 1.
+
+    Returns:
+        ee.List: A list of date sequence.
+    """
+
+    def get_quarter(d):
+        return str((int(d[5:7]) - 1) // 3 * 3 + 1).zfill(2)
+
+    def get_monday(d):
+        date_obj = datetime.datetime.strptime(d, "%Y-%m-%d")
+        start_of_week = date_obj - datetime.timedelta(days=date_obj.weekday())
+        return start_of_week.strftime("%Y-%m-%d")
+
+    if unit == "year":
+        start = start[:4] + "-01-01"
+    elif unit == "month":
+        start = start[:7] + "-01"
+    elif unit == "quarter":
+        start = start[:5] + get_quarter(start) + "-01"
+    elif unit == "week":
+        start = get_monday(start)
+
+    start_date = ee.Date(start)
+    end_date = ee.Date(end)
+
+    if unit != "quarter":
+        count = ee.Number(end_date.difference(start_date, unit)).toInt()
+        num_seq = ee.List.sequence(0, count)
+        if step > 1:
+            num_seq = num_seq.slice(0, num_seq.size(), step)
+        date_seq = num_seq.map(
+            lambda d: start_date.advance(d, unit).format(date_format)
+        )
+
+    else:
+        unit = "month"
+        count = ee.Number(end_date.difference(start_date, unit)).divide(3).toInt()
+        num_seq = ee.List.sequence(0, count.multiply(3), 3)
+        date_seq = num_seq.map(
+            lambda d: start_date.advance(d, unit).format(date_format)
+        )
+
+    return date_seq
+
+
+def get_current_year() -> int:
     """Get the current year.
 
     Returns:
@@ -545,6 +1418,89 @@ def get_current_year() -> int:
     return today.year
 
 
+def add_months(date: datetime.date, months: int) -> datetime.date:
+    """Add a number of months to a date, clamping the day to the month length.
+
+    Args:
+        date : The start date.
+        months : The number of months to add.
+
+    Returns:
+        datetime.date: The shifted date.
+    """
+    month_index = date.month - 1 + months
+    year = date.year + month_index // 12
+    month = month_index % 12 + 1
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last_day = (next_month - datetime.timedelta(days=1)).day
+    return datetime.date(year, month, min(date.day, last_day))
+
+
+def get_landsat_periods(
+    start_year: int,
+    end_year: int,
+    start_date: str = "06-10",
+    end_date: str = "09-20",
+    frequency: str = "year",
+    step: int = 1,
+) -> list[tuple[datetime.date, datetime.date]]:
+    """Get the composite periods of a Landsat time series on the client.
+
+    Annual periods run from start_date to end_date (month-day) of each year.
+    Quarterly and monthly periods cover the whole years.
+
+    Args:
+        start_year : Starting year.
+        end_year : Ending year.
+        start_date : Starting date (month-day) of each annual period. Defaults to '06-10'.
+        end_date : Ending date (month-day) of each annual period. Defaults to '09-20'.
+        frequency : Frequency of the periods: year, quarter, month. Defaults to 'year'.
+        step : The step size between periods. Defaults to 1.
+
+    Returns:
+        list[tuple[datetime.date, datetime.date]]: The start and (exclusive) end date of each period.
+    """
+    if frequency == "year":
+        start = datetime.date(start_year, int(start_date[:2]), int(start_date[3:5]))
+        end = datetime.date(start_year, int(end_date[:2]), int(end_date[3:5]))
+        n_days = datetime.timedelta(days=abs((end - start).days))
+        return [
+            (
+                add_months(start, (year - start_year) * 12),
+                add_months(start, (year - start_year) * 12) + n_days,
+            )
+            for year in range(start_year, end_year + 1, step)
+        ]
+
+    months = {"quarter": 3, "month": 1}[frequency]
+    first = datetime.date(start_year, 1, 1)
+    count = (end_year - start_year + 1) * 12 // months
+    return [
+        (add_months(first, i * months), add_months(first, (i + 1) * months))
+        for i in range(0, count, step)
+    ]
+
+
+def format_joda_date(date: datetime.date, date_format: str) -> str:
+    """Format a date with the year, month and day tokens of a Joda-Time pattern.
+
+    Args:
+        date : The date to format.
+        date_format : A pattern such as 'YYYY', 'YYYY-MM' or 'YYYY-MM-dd'.
+
+    Returns:
+        str: The formatted date.
+    """
+    for token, directive in (
+        ("YYYY", "%Y"),
+        ("yyyy", "%Y"),
+        ("MM", "%m"),
+        ("dd", "%d"),
+    ):
+        date_format = date_format.replace(token, directive)
+    return date.strftime(date_format)
+
+
 # Generate landsat timeseries, from GEEMAP
 def landsat_timeseries(
     roi: "ee.Geometry" = None,
@@ -556,6 +1512,7 @@ def landsat_timeseries(
     frequency: str = "year",
     date_format: str = None,
     step: int = 1,
+    bands: list[str] = None,
 ) -> "ee.ImageCollection":
     """Generates an annual Landsat ImageCollection. This algorithm is adapted from https://gist.github.com/jdbcode/76b9ac49faf51627ebd3ff988e10adbc. A huge thank you to Justin Braaten for sharing his fantastic work.
 
@@ -569,6 +1526,7 @@ def landsat_timeseries(
         frequency : Frequency of the timelapse: year, quarter, month. Defaults to 'year'.
         date_format : Format of the date. Defaults to None.
         step : The step size to use when creating the date sequence. Defaults to 1.
+        bands : Bands to composite, from ['Blue', 'Green', 'Red', 'NIR', 'SWIR1', 'SWIR2']. Defaults to None, which means all six bands.
 
     Returns:
         ee.ImageCollection: Returns an ImageCollection containing annual Landsat images.
@@ -611,11 +1569,12 @@ def landsat_timeseries(
         "quarter": "YYYY-MM",
     }
 
-    if date_format is None:
-        date_format = feq_dict[frequency]
-
     if frequency not in feq_dict:
         arcpy.AddError("frequency must be year, quarter, or month.")
+        raise ValueError("frequency must be year, quarter, or month.")
+
+    if date_format is None:
+        date_format = feq_dict[frequency]
 
     # Setup vars to get dates.
     if (
@@ -652,274 +1611,208 @@ def landsat_timeseries(
         arcpy.AddMessage("The input dates are invalid.")
         arcpy.AddError(e)
 
-    def days_between(d1, d2):
-        d1 = datetime.datetime.strptime(d1, "%Y-%m-%d")
-        d2 = datetime.datetime.strptime(d2, "%Y-%m-%d")
-        return abs((d2 - d1).days)
-
-    n_days = days_between(
-        str(start_year) + "-" + start_date, str(start_year) + "-" + end_date
+    all_bands = ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"]
+    if bands is None:
+        bands = all_bands
+    elif not all(band in all_bands for band in bands):
+        error_message = f"The bands must be selected from: {', '.join(all_bands)}"
+        arcpy.AddError(error_message)
+        raise ValueError(error_message)
+
+    # Build the composite periods on the client.
+    periods = get_landsat_periods(
+        start_year, end_year, start_date, end_date, frequency, step
     )
-    start_month = int(start_date[:2])
-    start_day = int(start_date[3:5])
 
-    # Landsat collection preprocessingEnabled.
-    # Get Landsat surface reflectance collections for OLI, ETM+ and TM sensors.
-    LC09col = ee.ImageCollection("LANDSAT/LC09/C02/T1_L2")
-    LC08col = ee.ImageCollection("LANDSAT/LC08/C02/T1_L2")
-    LE07col = ee.ImageCollection("LANDSAT/LE07/C02/T1_L2")
-    LT05col = ee.ImageCollection("LANDSAT/LT05/C02/T1_L2")
-    LT04col = ee.ImageCollection("LANDSAT/LT04/C02/T1_L2")
-
-    # Define a collection filter by date, bounds, and quality.
-    def colFilter(col, roi, start_date, end_date):
-        """Filter an image collection by region of interest and date range.
-
-        Args:
-            col (ee.ImageCollection): Input image collection
-            roi (ee.Geometry): Region of interest
-            start_date (str): Start date in 'YYYY-MM-DD' format
-            end_date (str): End date in 'YYYY-MM-DD' format
-
-        Returns:
-            ee.ImageCollection: Filtered image collection
-        """
-        return col.filterBounds(roi).filterDate(start_date, end_date)
-
-    # Function to get and rename bands of interest from OLI.
-    def renameOli(img):
-        """Rename bands of interest from OLI sensor.
-
-        Args:
-            img (ee.Image): Input image from OLI sensor
-
-        Returns:
-            ee.Image: Image with renamed bands
-        """
-        return img.select(
-            ["SR_B2", "SR_B3", "SR_B4", "SR_B5", "SR_B6", "SR_B7"],
-            ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"],
+    # Scale the selected surface reflectance bands only, then mask clouds,
+    # cloud shadows, snow and water with Fmask bits 0-4 of QA_PIXEL.
+    def prep(img, sr_bands):
+        optical = img.select(list(sr_bands), bands).multiply(0.0000275).add(-0.2)
+        if apply_fmask:
+            qa_mask = img.select("QA_PIXEL").bitwiseAnd(int("11111", 2)).eq(0)
+            optical = optical.updateMask(qa_mask)
+        return optical.resample("bicubic")
+
+    # Filter each sensor collection by bounds once.
+    sensors = [
+        (
+            datetime.date.fromisoformat(first_date),
+            datetime.date.fromisoformat(last_date) if last_date else None,
+            tuple(band_dict[band] for band in bands),
+            ee.ImageCollection(asset_id).filterBounds(roi),
         )
+        for asset_id, first_date, last_date, band_dict in LANDSAT_SENSORS
+    ]
 
-    # Function to get and rename bands of interest from ETM+.
-    def renameEtm(img):
-        """Rename bands of interest from ETM+ sensor.
-
-        Args:
-            img (ee.Image): Input image from ETM+ sensor
-
-        Returns:
-            ee.Image: Image with renamed bands
-        """
-        return img.select(
-            ["SR_B1", "SR_B2", "SR_B3", "SR_B4", "SR_B5", "SR_B7"],
-            ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"],
+    def get_sensors(period):
+        """Get the indexes of the sensors operating during a period."""
+        period_start, period_end = period
+        return tuple(
+            i
+            for i, (first_date, last_date, _, _) in enumerate(sensors)
+            if first_date < period_end
+            and (last_date is None or last_date > period_start)
         )
 
-    def fmask(image):
-        """Apply Fmask (Function of mask) for cloud and shadow masking.
-
-        Args:
-            image (ee.Image): Input Landsat image
+    # Make a dummy image for missing periods.
+    fillerValues = ee.List.repeat(0, len(bands))
+    dummyImg = ee.Image.constant(fillerValues).rename(bands).selfMask().int16()
 
-        Returns:
-            ee.Image: Masked image with scaled surface reflectance values
-
-        Notes:
-            Bit values in QA_PIXEL band:
-            - Bit 0: Fill
-            - Bit 1: Dilated Cloud
-            - Bit 2: Cirrus
-            - Bit 3: Cloud
-            - Bit 4: Cloud Shadow
-        """
-        qaMask = image.select("QA_PIXEL").bitwiseAnd(int("11111", 2)).eq(0)
-        opticalBands = image.select("SR_B.").multiply(0.0000275).add(-0.2)
-        return image.addBands(opticalBands, None, True).updateMask(qaMask)
+    # Sensors with the same band names are prepared together.
+    layouts = list(dict.fromkeys(sr_bands for _, _, sr_bands, _ in sensors))
+    empty_col = ee.ImageCollection([])
 
-    # Define function to prepare OLI images.
-    def prepOli(img):
-        """Prepare OLI sensor images by applying scaling and optional masking.
+    # Consecutive periods with the same operating sensors form a group, with
+    # the index of its first and last period and, for each band layout, the
+    # merged collection of its sensors.
+    groups = []
+    for sensor_ids, group in itertools.groupby(
+        enumerate(periods), key=lambda item: get_sensors(item[1])
+    ):
+        indexes = [index for index, _ in group]
+        layout_cols = []
+        for layout in layouts:
+            cols = [sensors[i][3] for i in sensor_ids if sensors[i][2] == layout]
+            col = cols[0] if cols else empty_col
+            for other in cols[1:]:
+                col = col.merge(other)
+            layout_cols.append(col)
+        groups.append([indexes[0], indexes[-1]] + layout_cols)
+
+    # Period dates are computed on the server from the first period, like the
+    # client periods, and the same composite function is mapped over the
+    # periods of every group, so the graph holds no per-period constants.
+    period_months = {"year": 12, "quarter": 3, "month": 1}[frequency]
+
+    def get_composite(group, index):
+        """Get the median composite of a period from the sensors of its group.
 
         Args:
-            img (ee.Image): Input OLI sensor image
+            group (ee.List): First and last period index and collections of the group
+            index (ee.Number): Index of the period
 
         Returns:
-            ee.Image: Processed image with renamed bands and bicubic resampling
+            ee.Image: Median composite with metadata properties
         """
-        orig = img
-        if apply_fmask:
-            img = fmask(img)
-        else:
-            img = img.select("SR_B.").multiply(0.0000275).add(-0.2)
-        img = renameOli(img)
-        return ee.Image(img.copyProperties(orig, orig.propertyNames())).resample(
-            "bicubic"
+        period_start = first_start.advance(
+            ee.Number(index).multiply(period_months * step), "month"
         )
-
-    # Define function to prepare ETM+ images.
-    def prepEtm(img):
-        """Prepare ETM+ sensor images by applying scaling and optional masking.
-
-        Args:
-            img (ee.Image): Input ETM+ sensor image
-
-        Returns:
-            ee.Image: Processed image with renamed bands and bicubic resampling
-        """
-        orig = img
-        if apply_fmask:
-            img = fmask(img)
+        if frequency == "year":
+            period_end = period_start.advance(n_days, "day")
         else:
-            img = img.select("SR_B.").multiply(0.0000275).add(-0.2)
-        img = renameEtm(img)
-        return ee.Image(img.copyProperties(orig, orig.propertyNames())).resample(
-            "bicubic"
-        )
-
-    # Get annual median collection.
-    def getAnnualComp(y):
-        """Get annual median composite for a given year.
-
-        Args:
-            y (int): Year to process
-
-        Returns:
-            ee.Image: Annual median composite with metadata properties
-        """
-        startDate = ee.Date.fromYMD(
-            ee.Number(y), ee.Number(start_month), ee.Number(start_day)
-        )
-        endDate = startDate.advance(ee.Number(n_days), "day")
-
-        # Filter collections and prepare them for merging.
-        LC09coly = colFilter(LC09col, roi, startDate, endDate).map(prepOli)
-        LC08coly = colFilter(LC08col, roi, startDate, endDate).map(prepOli)
-        LE07coly = colFilter(LE07col, roi, startDate, endDate).map(prepEtm)
-        LT05coly = colFilter(LT05col, roi, startDate, endDate).map(prepEtm)
-        LT04coly = colFilter(LT04col, roi, startDate, endDate).map(prepEtm)
-
-        # Merge the collections.
-        col = LC09coly.merge(LC08coly).merge(LE07coly).merge(LT05coly).merge(LT04coly)
-
-        yearImg = col.median()
-        nBands = yearImg.bandNames().size()
-        yearImg = ee.Image(ee.Algorithms.If(nBands, yearImg, dummyImg))
-        return yearImg.set(
-            {
-                "year": y,
-                "system:time_start": startDate.millis(),
-                "nBands": nBands,
-                "system:date": ee.Date(startDate).format(date_format),
-            }
+            period_end = period_start.advance(period_months, "month")
+        col = None
+        for i, layout in enumerate(layouts):
+            layout_col = (
+                ee.ImageCollection(group.get(i + 2))
+                .filterDate(period_start, period_end)
+                .map(lambda img, layout=layout: prep(img, layout))
+            )
+            col = layout_col if col is None else col.merge(layout_col)
+        img = col.median()
+        nBands = img.bandNames().size()
+        img = ee.Image(ee.Algorithms.If(nBands, img, dummyImg))
+        properties = {
+            "system:time_start": period_start.millis(),
+            "nBands": nBands,
+            "system:date": period_start.format(date_format),
+        }
+        if frequency == "year":
+            properties["year"] = period_start.get("year")
+        return img.set(properties)
+
+    def get_group_composites(group):
+        group = ee.List(group)
+        return ee.List.sequence(group.get(0), group.get(1)).map(
+            lambda index: get_composite(group, index)
         )
 
-    # Get monthly median collection.
-    def getMonthlyComp(startDate):
-        """Get monthly median composite starting from a given date.
+    composites = ee.List([])
+    if periods:
+        first_start = ee.Date(periods[0][0].isoformat())
+        n_days = (periods[0][1] - periods[0][0]).days
+        composites = ee.List(groups).map(get_group_composites).flatten()
 
-        Args:
-            startDate (ee.Date): Start date for the monthly composite
+    # Convert image composite list to collection.
+    imgCol = ee.ImageCollection.fromImages(composites)
 
-        Returns:
-            ee.Image: Monthly median composite with metadata properties
-        """
-        startDate = ee.Date(startDate)
-        endDate = startDate.advance(1, "month")
-
-        # Filter collections and prepare them for merging.
-        LC09coly = colFilter(LC09col, roi, startDate, endDate).map(prepOli)
-        LC08coly = colFilter(LC08col, roi, startDate, endDate).map(prepOli)
-        LE07coly = colFilter(LE07col, roi, startDate, endDate).map(prepEtm)
-        LT05coly = colFilter(LT05col, roi, startDate, endDate).map(prepEtm)
-        LT04coly = colFilter(LT04col, roi, startDate, endDate).map(prepEtm)
-
-        # Merge the collections.
-        col = LC09coly.merge(LC08coly).merge(LE07coly).merge(LT05coly).merge(LT04coly)
-
-        monthImg = col.median()
-        nBands = monthImg.bandNames().size()
-        monthImg = ee.Image(ee.Algorithms.If(nBands, monthImg, dummyImg))
-        return monthImg.set(
-            {
-                "system:time_start": startDate.millis(),
-                "nBands": nBands,
-                "system:date": ee.Date(startDate).format(date_format),
-            }
-        )
+    imgCol = imgCol.map(
+        lambda img: img.clip(roi).set({"coordinates": roi.coordinates()})
+    )
 
-    # Get quarterly median collection.
-    def getQuarterlyComp(startDate):
-        """Get quarterly (3-month) median composite starting from a given date.
+    arcpy.AddMessage(
+        f"Landsat time series of {len(periods)} composites, "
+        f"serialized graph size: {len(imgCol.serialize()):,} bytes"
+    )
 
-        Args:
-            startDate (ee.Date): Start date for the quarterly composite
+    return imgCol
 
-        Returns:
-            ee.Image: Quarterly median composite with metadata properties
-        """
-        startDate = ee.Date(startDate)
 
-        endDate = startDate.advance(3, "month")
+def download_cached_frames(
+    collection: "ee.ImageCollection",
+    periods: list[tuple[datetime.date, datetime.date]],
+    video_args: dict,
+    cache_key_parts: list,
+    frame_cache_dir: str = None,
+    max_workers: int = 8,
+) -> list[pathlib.Path]:
+    """Downloads the frames of a time series, reusing frames cached on disk.
 
-        # Filter collections and prepare them for merging.
-        LC09coly = colFilter(LC09col, roi, startDate, endDate).map(prepOli)
-        LC08coly = colFilter(LC08col, roi, startDate, endDate).map(prepOli)
-        LE07coly = colFilter(LE07col, roi, startDate, endDate).map(prepEtm)
-        LT05coly = colFilter(LT05col, roi, startDate, endDate).map(prepEtm)
-        LT04coly = colFilter(LT04col, roi, startDate, endDate).map(prepEtm)
+    Frames are stored as PNG files named after their period, in a folder keyed
+    by cache_key_parts and the thumbnail parameters, so that only periods that
+    are not cached yet are downloaded. Periods that have not ended yet are
+    always downloaded again, since new scenes may still be added to them.
 
-        # Merge the collections.
-        col = LC09coly.merge(LC08coly).merge(LE07coly).merge(LT05coly).merge(LT04coly)
+    Args:
+        collection : An ee.ImageCollection with one image per period, in order.
+        periods : The start and end date of each period.
+        video_args : Parameters for the video thumbnail, as for download_ee_video.
+        cache_key_parts : JSON-serializable values that identify the frames, such as the ROI hash and visualization parameters.
+        frame_cache_dir : Directory of the frame cache. Defaults to a folder in the temp directory.
+        max_workers : The maximum number of concurrent frame requests. Defaults to 8.
 
-        quarter = col.median()
-        nBands = quarter.bandNames().size()
-        quarter = ee.Image(ee.Algorithms.If(nBands, quarter, dummyImg))
-        return quarter.set(
-            {
-                "system:time_start": startDate.millis(),
-                "nBands": nBands,
-                "system:date": ee.Date(startDate).format(date_format),
-            }
+    Returns:
+        list[pathlib.Path]: The frame file of each period, in order.
+    """
+    if frame_cache_dir is None:
+        frame_cache_dir = pathlib.Path(tempfile.gettempdir()) / "arcgee_frames"
+
+    thumb_args = get_frame_thumb_args(video_args)
+    key_args = {key: value for key, value in thumb_args.items() if key != "region"}
+    cache_key = hashlib.sha1(
+        json.dumps([cache_key_parts, key_args], sort_keys=True, default=str).encode(
+            "utf-8"
         )
+    ).hexdigest()[:16]
+    frame_dir = pathlib.Path(frame_cache_dir) / cache_key
+    frame_dir.mkdir(parents=True, exist_ok=True)
 
-    # Make a dummy image for missing years.
-    bandNames = ee.List(["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2", "pixel_qa"])
-    fillerValues = ee.List.repeat(0, bandNames.size())
-    dummyImg = ee.Image.constant(fillerValues).rename(bandNames).selfMask().int16()
-
-    # Make list of /quarterly/monthly image composites.
-
-    if frequency == "year":
-        years = ee.List.sequence(start_year, end_year, step)
-        imgList = years.map(getAnnualComp)
-    elif frequency == "quarter":
-        quarters = date_sequence(
-            str(start_year) + "-01-01",
-            str(end_year) + "-12-31",
-            "quarter",
-            date_format,
-            step,
-        )
-        imgList = quarters.map(getQuarterlyComp)
-    elif frequency == "month":
-        months = date_sequence(
-            str(start_year) + "-01-01",
-            str(end_year) + "-12-31",
-            "month",
-            date_format,
-            step,
-        )
-        imgList = months.map(getMonthlyComp)
+    today = datetime.date.today()
+    frame_files = [
+        frame_dir / f"{start.isoformat()}_{end.isoformat()}.png"
+        for start, end in periods
+    ]
+    missing = [
+        i
+        for i, (frame_file, (_, end)) in enumerate(zip(frame_files, periods))
+        if not frame_file.exists() or end > today
+    ]
+    arcpy.AddMessage(
+        f"{len(periods) - len(missing)} of {len(periods)} frames found in the "
+        f"cache at {frame_dir}. Downloading {len(missing)} frames ..."
+    )
 
-    # Convert image composite list to collection.
-    imgCol = ee.ImageCollection.fromImages(imgList)
+    def download_frame(i):
+        image = ee.Image(collection.toList(1, i).get(0))
+        content = download_ee_frame(image, thumb_args)
+        temp_file = frame_files[i].with_suffix(".tmp")
+        temp_file.write_bytes(content)
+        os.replace(temp_file, frame_files[i])
 
-    imgCol = imgCol.map(
-        lambda img: img.clip(roi).set({"coordinates": roi.coordinates()})
-    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(download_frame, missing))
 
-    return imgCol
+    return frame_files
 
 
 # Create landsat timelapse, simplified from GEEMAP
@@ -937,6 +1830,9 @@ def landsat_timelapse(
     crs: str = "EPSG:3857",
     apply_fmask: bool = True,
     frequency: str = "year",
+    cache_frames: bool = False,
+    frame_cache_dir: str = None,
+    max_workers: int = 8,
 ) -> str:
     """Generates a Landsat timelapse GIF image. This function is adapted from https://emaprlab.users.earthengine.app/view/lt-gee-time-series-animator. A huge thank you to Justin Braaten for sharing his fantastic work.
 
@@ -947,13 +1843,16 @@ def landsat_timelapse(
         end_year : Ending year for the timelapse. Defaults to None, which will use the current year.
         start_date : Starting date (month-day) each year for filtering ImageCollection. Defaults to '06-10'.
         end_date : Ending date (month-day) each year for filtering ImageCollection. Defaults to '09-20'.
-        bands : Three bands selected from ['Blue', 'Green', 'Red', 'NIR', 'SWIR1', 'SWIR2', 'pixel_qa']. Defaults to ['NIR', 'Red', 'Green'].
+        bands : Three bands selected from ['Blue', 'Green', 'Red', 'NIR', 'SWIR1', 'SWIR2']. Defaults to ['NIR', 'Red', 'Green'].
         vis_params : Visualization parameters. Defaults to None.
         dimensions : a number or pair of numbers (in format 'WIDTHxHEIGHT') Maximum dimensions of the thumbnail to render, in pixels. If only one number is passed, it is used as the maximum, and the other dimension is computed by proportional scaling. Defaults to 768.
         frames_per_second : Animation speed. Defaults to 5.
         crs : The coordinate reference system to use. Defaults to "EPSG:3857".
         apply_fmask : Whether to apply Fmask (Function of mask) for automated clouds, cloud shadows, snow, and water masking.
         frequency : Frequency of the timelapse: year, quarter, month. Defaults to 'year'.
+        cache_frames : Whether to render frames one by one and cache them on disk, so that a rerun only downloads the periods that are missing. Defaults to False.
+        frame_cache_dir : Directory of the frame cache. Defaults to a folder in the temp directory.
+        max_workers : The maximum number of concurrent frame requests when caching frames. Defaults to 8.
 
     Returns:
         str: File path to the output GIF image.
@@ -988,7 +1887,7 @@ def landsat_timelapse(
     if end_year is None:
         end_year = get_current_year()
 
-    allowed_bands = ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2", "pixel_qa"]
+    allowed_bands = ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"]
 
     if len(bands) == 3 and all(x in allowed_bands for x in bands):
         pass
@@ -998,6 +1897,9 @@ def landsat_timelapse(
                 ", ".join(allowed_bands)
             )
         )
+        return
+
+    from PIL import Image
 
     try:
         if vis_params is None:
@@ -1015,6 +1917,7 @@ def landsat_timelapse(
             end_date,
             apply_fmask,
             frequency,
+            bands=bands,
         )
 
         col = raw_col.select(bands).map(
@@ -1035,11 +1938,35 @@ def landsat_timelapse(
         video_args["min"] = 0
         video_args["max"] = 255
 
-        download_ee_video(col, video_args, str(out_gif))
+        # The composite periods and their labels are known on the client.
+        periods = get_landsat_periods(
+            start_year, end_year, start_date, end_date, frequency
+        )
+        date_format = "YYYY" if frequency == "year" else "YYYY-MM"
+        date_list = [format_joda_date(start, date_format) for start, _ in periods]
+
+        # Download to a separate file so the date labels are written to out_gif.
+        raw_gif = out_gif.with_name(out_gif.stem + "_raw.gif")
+        if cache_frames:
+            frame_files = download_cached_frames(
+                col,
+                periods,
+                video_args,
+                [get_expression_hash(roi), vis_params, apply_fmask, crs],
+                frame_cache_dir,
+                max_workers,
+            )
+            save_frames_to_video(
+                (Image.open(frame_file) for frame_file in frame_files),
+                str(raw_gif),
+                frames_per_second,
+            )
+        else:
+            download_ee_video(col, video_args, str(raw_gif))
 
-        if out_gif.exists():
-            date_list = col.aggregate_array("system:date").getInfo()
-            add_date_to_gif(str(out_gif), str(out_gif), date_list)
+        if raw_gif.exists():
+            add_date_to_gif(str(raw_gif), str(out_gif), date_list)
+            raw_gif.unlink()
 
         return str(out_gif)
 
@@ -1127,35 +2054,156 @@ def get_ee_datatype(asset_id: str) -> str:
     return data_type
 
 
-def init_and_set_tags(project: str = None, workload_tag: str = None) -> None:
-    """Initialize Earth Engine and set user agent and workload tags.
+class DeferredValue:
+    """Client-side value of an Earth Engine object, evaluated by a GetInfoBatch."""
 
-    Args:
-        project : Google Cloud project ID.
-        workload_tag : Custom workload tag.
-    """
-    ee.Initialize(project=project)
+    def __init__(self, batch: "GetInfoBatch") -> None:
+        """Create a pending value.
 
-    user_agent = f"ArcGIS_EE/{__version__}/ArcPy/{arcpy.__version__}"
-    if ee.data.getUserAgent() != user_agent:
-        ee.data.setUserAgent(user_agent)
+        Args:
+            batch : The batch that evaluates the value.
+        """
+        self._batch = batch
+        self._done = False
+        self._value = None
+        self._error = None
 
-    ee.data.setDefaultWorkloadTag("arcgis-ee-connector")
+    def _set(self, value: object = None, error: Exception = None) -> None:
+        self._value = value
+        self._error = error
+        self._done = True
 
-    if workload_tag is not None:
-        ee.data.setWorkloadTag(workload_tag)
+    def done(self) -> bool:
+        """Check if the value has been evaluated."""
+        return self._done
 
-    # Check initialization setup.
-    project_id = ee.data.getProjectConfig()["name"].split("/")[1]
-    arcpy.AddMessage(f"Current project ID: {project_id}")
-    arcpy.AddMessage(f"Current user agent: {ee.data.getUserAgent()}")
-    arcpy.AddMessage(f"Current workload tag: {ee.data.getWorkloadTag()}")
-    arcpy.AddMessage("Earth Engine is ready to use.")
+    def result(self) -> object:
+        """Get the value, flushing the batch if it has not been evaluated yet.
 
-    return
+        Returns:
+            object : The value, as returned by getInfo.
 
+        Raises:
+            ee.EEException: If Earth Engine fails to compute the value.
+        """
+        if not self._done:
+            self._batch.flush()
+        if self._error is not None:
+            raise self._error
+        return self._value
 
-# Get ROI from the object extent.
+
+class GetInfoBatch:
+    """Evaluate independent Earth Engine objects together in one request.
+
+    Objects registered with defer are evaluated on the next flush, or when
+    the result of any of them is first needed, with a single getInfo call
+    on an ee.Dictionary of all pending objects. Values found in the getInfo
+    cache are not requested again.
+    """
+
+    def __init__(self) -> None:
+        self._pending = []
+        self.values = 0
+        self.cached = 0
+        self.round_trips = 0
+
+    def defer(self, ee_object: "ee.ComputedObject") -> DeferredValue:
+        """Register an Earth Engine object to evaluate on the next flush.
+
+        Args:
+            ee_object : The Earth Engine object to evaluate.
+
+        Returns:
+            DeferredValue : The pending value of the object.
+        """
+        deferred = DeferredValue(self)
+        self._pending.append((deferred, ee_object))
+        self.values += 1
+        return deferred
+
+    def flush(self) -> None:
+        """Evaluate all pending objects."""
+        pending, self._pending = self._pending, []
+        missing = []
+        for deferred, ee_object in pending:
+            found, value = cache.get_cached_info(ee_object)
+            if found:
+                deferred._set(value)
+                self.cached += 1
+            else:
+                missing.append((deferred, ee_object))
+        if not missing:
+            return
+
+        self.round_trips += 1
+        try:
+            values = ee.Dictionary(
+                {str(i): ee_object for i, (_, ee_object) in enumerate(missing)}
+            ).getInfo()
+        except ee.EEException:
+            # A single failing object fails the whole request, so evaluate the
+            # objects one by one to keep the other values.
+            for deferred, ee_object in missing:
+                self.round_trips += 1
+                try:
+                    value = ee_object.getInfo()
+                except ee.EEException as e:
+                    deferred._set(error=e)
+                    continue
+                deferred._set(value)
+                cache.put_cached_info(ee_object, value)
+            return
+
+        for i, (deferred, ee_object) in enumerate(missing):
+            value = values.get(str(i))
+            deferred._set(value)
+            cache.put_cached_info(ee_object, value)
+
+    def report(self) -> None:
+        """Add a tool message with the number of values and requests."""
+        if not self.values:
+            return
+        arcpy.AddMessage(
+            f"Evaluated {self.values} Earth Engine values in {self.round_trips} "
+            f"requests ({self.cached} from the getInfo cache)."
+        )
+
+
+def init_and_set_tags(project: str = None, workload_tag: str = None) -> None:
+    """Initialize Earth Engine and set user agent and workload tags.
+
+    Args:
+        project : Google Cloud project ID.
+        workload_tag : Custom workload tag.
+    """
+    ee.Initialize(project=project)
+
+    user_agent = f"ArcGIS_EE/{__version__}/ArcPy/{arcpy.__version__}"
+    if ee.data.getUserAgent() != user_agent:
+        ee.data.setUserAgent(user_agent)
+
+    ee.data.setDefaultWorkloadTag("arcgis-ee-connector")
+
+    if workload_tag is not None:
+        ee.data.setWorkloadTag(workload_tag)
+
+    # Check initialization setup.
+    # ee.Initialize already fails for projects that cannot be used, so only
+    # ask the server for the project ID when it is taken from the credentials.
+    if project:
+        project_id = project
+    else:
+        project_id = ee.data.getProjectConfig()["name"].split("/")[1]
+    arcpy.AddMessage(f"Current project ID: {project_id}")
+    arcpy.AddMessage(f"Current user agent: {ee.data.getUserAgent()}")
+    arcpy.AddMessage(f"Current workload tag: {ee.data.getWorkloadTag()}")
+    arcpy.AddMessage("Earth Engine is ready to use.")
+
+    return
+
+
+# Get ROI from the object extent.
 # Use string-based type hints to avoid type checking errors in ArcGIS Pro 3.2.
 def get_roi_from_object(obj: "ee.Image | ee.FeatureCollection") -> "ee.Geometry.BBox":
     """Get the ROI from the object extent.
@@ -1210,30 +2258,64 @@ def get_roi_by_bound_type(
 
 # Get centroid and extent coordinates of input image or feature collection.
 def get_object_centroid(
-    obj: "ee.Image | ee.FeatureCollection", error_margin: float
+    obj: "ee.Image | ee.FeatureCollection",
+    error_margin: float,
+    bounds_only: bool = False,
 ) -> tuple[list[float], list[list[float]]]:
     """Get the centroid and extent coordinates of an Earth Engine object.
 
+    The object geometry is evaluated once and both values are fetched in a
+    single round trip. Results are memoized per object expression.
+
     Args:
         obj : Earth Engine object
         error_margin : Error margin for geometry calculations
+        bounds_only : Only fetch the bounds and use the bounds center as centroid.
 
     Returns:
         tuple: (centroid_coords, extent_coords) where:
             - centroid_coords is [lon, lat] of centroid
             - extent_coords is list of corner coordinates defining the bounds
     """
-    # Get centroid geometry from input image.
-    centroid = obj.geometry().centroid(error_margin)
-    # Coordinates in list.
-    centroid_coords = centroid.coordinates().getInfo()
-    # Get image extent.
-    extent = obj.geometry().bounds(error_margin)
-    # Coordinates in list.
-    extent_coords = extent.coordinates().get(0).getInfo()
+    cache_key = (get_expression_hash(obj), error_margin, bounds_only)
+    if cache_key in _object_extent_cache:
+        return _object_extent_cache[cache_key]
+
+    # Get the object geometry once for both centroid and bounds.
+    geometry = obj.geometry(error_margin)
+    bounds = geometry.bounds(error_margin).coordinates().get(0)
+    if bounds_only:
+        extent_coords = bounds.getInfo()
+        x_min, y_min, x_max, y_max = convert_coords_to_bbox(extent_coords)
+        centroid_coords = [(x_min + x_max) / 2, (y_min + y_max) / 2]
+    else:
+        result = ee.Dictionary(
+            {
+                "centroid": geometry.centroid(error_margin).coordinates(),
+                "bounds": bounds,
+            }
+        ).getInfo()
+        centroid_coords = result["centroid"]
+        extent_coords = result["bounds"]
+
+    _object_extent_cache[cache_key] = (centroid_coords, extent_coords)
     return centroid_coords, extent_coords
 
 
+# Check if the extent covers the whole globe.
+def is_global_extent(extent_coords: list[list[float]]) -> bool:
+    """Check if the extent coordinates cover the whole globe.
+
+    Args:
+        extent_coords : List of corner coordinates defining the bounds
+
+    Returns:
+        bool: True if the extent spans all longitudes, False otherwise
+    """
+    x_min, y_min, x_max, y_max = convert_coords_to_bbox(extent_coords)
+    return (x_max - x_min) >= 359
+
+
 # Convert coordinates to bounding box values.
 def convert_coords_to_bbox(
     coords: list[list[float]],
@@ -1356,10 +2438,32 @@ def whether_use_projection(ic: "ee.ImageCollection") -> bool:
     Returns:
         bool: True if projection should be used, False if CRS code should be used
     """
-    # Start with original projection.
-    prj = ic.first().select(0).projection()
-    # Check crs code.
-    crs_code = prj.crs().getInfo()
+    # Check crs code of the original projection.
+    crs_code = cache.get_info(get_first_band_crs(ic))
+    return whether_use_projection_for_crs(crs_code)
+
+
+def get_first_band_crs(ic: "ee.ImageCollection") -> "ee.String":
+    """Get the CRS code of the first band of the first image in a collection.
+
+    Args:
+        ic : Input image collection
+
+    Returns:
+        ee.String: The CRS code, evaluated to None if it is unknown
+    """
+    return ic.first().select(0).projection().crs()
+
+
+def whether_use_projection_for_crs(crs_code: str) -> bool:
+    """Check whether to use projection or CRS code for an evaluated CRS code.
+
+    Args:
+        crs_code : CRS code of the first band, such as "EPSG:32610", or None if it is unknown
+
+    Returns:
+        bool: True if projection should be used, False if CRS code should be used
+    """
     # Three scenarios: EPSG is unknown, EPSG is 4326, EPSG is others.
     if (crs_code is None) or (crs_code == "EPSG:4326"):
         use_projection = True
@@ -1409,7 +2513,7 @@ def image_to_geotiff(
     # ---- Get native projection and CRS from the first band of the first image ----
     first_img = ic.first().select(0)
     prj = first_img.projection()
-    crs_code = prj.crs().getInfo()  # e.g. "EPSG:4326" or similar
+    crs_code = cache.get_info(prj.crs())  # e.g. "EPSG:4326" or similar
 
     # ---- Open dataset with xarray + ee engine ----
     open_kwargs: dict = {"engine": "ee", "scale": scale_ds}
@@ -1564,6 +2668,92 @@ def image_to_geotiff(
     arcpy.AddMessage("Done.")
 
 
+# Name of the geometry column of feature classes written as CSV files.
+FEATURE_CSV_GEOMETRY_COLUMN = "geometry"
+
+# Raster formats converted to cloud optimized GeoTIFFs before upload.
+RASTER_EXTENSIONS = (".tif", ".tiff", ".img")
+
+
+# Convert rasters to cloud optimized GeoTIFFs in parallel before upload.
+def optimize_rasters(
+    files: list[str],
+    out_dir: str,
+    max_workers: int = None,
+    downcast: bool = True,
+) -> dict[str, str]:
+    """Convert rasters to compressed cloud optimized GeoTIFFs in worker processes.
+
+    Files that are not rasters, that fail to convert, or that would not get
+    smaller are kept as they are, except IMG files, which are always converted.
+
+    Args:
+        files : Paths to the local files
+        out_dir : Folder for the optimized rasters
+        max_workers : Maximum number of rasters converted at the same time. Defaults to the number of CPUs.
+        downcast : Whether to store the pixels in the smallest lossless data type. Defaults to True.
+
+    Returns:
+        dict : Path of the file to upload for each input file
+    """
+    start_time = time.time()
+    paths = {path: path for path in files}
+    rasters = [
+        path for path in files if pathlib.Path(path).suffix.lower() in RASTER_EXTENSIONS
+    ]
+    if not rasters:
+        return paths
+    arcpy.AddMessage(f"Optimize {len(rasters)} rasters before upload ...")
+
+    # The conversion is CPU bound, so it runs in processes. Inside ArcGIS Pro
+    # the interpreter is ArcGISPro.exe, which must not be started per worker.
+    context = multiprocessing.get_context("spawn")
+    if not pathlib.Path(sys.executable).name.lower().startswith("python"):
+        context.set_executable(
+            os.path.join(
+                sys.exec_prefix, "pythonw.exe" if os.name == "nt" else "python"
+            )
+        )
+
+    source_bytes = 0
+    out_bytes = 0
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {}
+        for i, path in enumerate(rasters):
+            # One folder per raster keeps file names unique without renaming.
+            out_path = (
+                pathlib.Path(out_dir) / str(i) / (pathlib.Path(path).stem + ".tif")
+            )
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            futures[path] = (
+                executor.submit(raster.optimize_raster, path, str(out_path), downcast),
+                str(out_path),
+            )
+        for path, (future, out_path) in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                arcpy.AddWarning(f"Could not optimize {path}, upload as is: {e}")
+                continue
+            if (
+                result["bytes"] >= result["source_bytes"]
+                and pathlib.Path(path).suffix.lower() != ".img"
+            ):
+                continue
+            paths[path] = out_path
+            source_bytes += result["source_bytes"]
+            out_bytes += result["bytes"]
+
+    saved = source_bytes - out_bytes
+    arcpy.AddMessage(
+        f"Optimized rasters in {time.time() - start_time:.1f} s: "
+        f"{source_bytes / 1024 / 1024:.1f} MB to {out_bytes / 1024 / 1024:.1f} MB, "
+        f"saving {saved / 1024 / 1024:.1f} MB "
+        f"({saved / source_bytes if source_bytes else 0:.0%})."
+    )
+    return paths
+
+
 # Upload local file to Google Cloud Storage bucket.
 def upload_to_gcs_bucket(
     storage_client: "google.cloud.storage.Client",
@@ -1588,45 +2778,372 @@ def upload_to_gcs_bucket(
 
     # Upload the file.
     blob.upload_from_filename(source_file_name)
+    invalidate_bucket_listing(bucket_name)
 
     full_blob_name = bucket_name + "/" + destination_blob_name
     arcpy.AddMessage(f"File {source_file_name} has been uploaded to {full_blob_name}.")
 
 
+def get_file_crc32c(file_path: str, chunk_size: int = 8 * 1024 * 1024) -> str:
+    """Get the CRC32C checksum of a local file in the format used by Cloud Storage.
+
+    Args:
+        file_path : Local file path
+        chunk_size : Number of bytes to read at a time. Defaults to 8 MB.
+
+    Returns:
+        str: Base64-encoded big-endian CRC32C checksum
+    """
+    import base64
+    import google_crc32c
+
+    checksum = google_crc32c.Checksum()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            checksum.update(chunk)
+    return base64.b64encode(checksum.digest()).decode("ascii")
+
+
+def is_blob_unchanged(file_path: str, blob: "google.cloud.storage.Blob") -> bool:
+    """Check if a Cloud Storage object has the same content as a local file.
+
+    The sizes are compared first, so the file is only read when they match.
+    Cloud Storage records a CRC32C checksum for every object, including
+    objects uploaded in parallel parts, which have no MD5 hash.
+
+    Args:
+        file_path : Local file path
+        blob : Existing Cloud Storage object
+
+    Returns:
+        bool: True if the object has the same size and checksum as the file
+    """
+    if blob.size != os.path.getsize(file_path) or not blob.crc32c:
+        return False
+    return get_file_crc32c(file_path) == blob.crc32c
+
+
+def upload_file_to_blob(
+    blob: "google.cloud.storage.Blob",
+    source_file_name: str,
+    chunk_threshold: int = 128 * 1024 * 1024,
+    chunk_size: int = 32 * 1024 * 1024,
+    max_workers: int = 8,
+) -> None:
+    """Upload a local file, sending large files in parallel parts.
+
+    Args:
+        blob : Destination Cloud Storage object
+        source_file_name : Local file path to upload
+        chunk_threshold : Files larger than this many bytes are uploaded in parallel parts. Defaults to 128 MB.
+        chunk_size : Size of each part in bytes. Defaults to 32 MB.
+        max_workers : Maximum number of parts uploaded at the same time. Defaults to 8.
+    """
+    if os.path.getsize(source_file_name) > chunk_threshold:
+        try:
+            from google.cloud.storage import transfer_manager
+        except ImportError:
+            # Older client libraries without the transfer manager.
+            transfer_manager = None
+        if transfer_manager is not None:
+            # Threads, because worker processes would start new ArcGIS Pro instances.
+            transfer_manager.upload_chunks_concurrently(
+                source_file_name,
+                blob,
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                worker_type=transfer_manager.THREAD,
+            )
+            return
+    blob.upload_from_filename(source_file_name)
+
+
+def upload_files_to_gcs_bucket(
+    storage_client: "google.cloud.storage.Client",
+    bucket_name: str,
+    uploads: list[tuple[str, str]],
+    max_workers: int = 8,
+    skip_unchanged: bool = True,
+) -> dict[str, int]:
+    """Upload local files to a Google Cloud Storage bucket in parallel.
+
+    Files that are already in the bucket with the same content are skipped.
+    The existing objects are listed once per folder, without the objects in
+    its subfolders, so checking a file costs no extra request.
+
+    Args:
+        storage_client : Storage client instance
+        bucket_name : Name of the GCS bucket
+        uploads : Pairs of local file path and destination path in the bucket
+        max_workers : Maximum number of files uploaded at the same time. Defaults to 8.
+        skip_unchanged : Whether to skip files that are unchanged in the bucket. Defaults to True.
+
+    Returns:
+        dict: Number of uploaded and skipped files, and number of uploaded bytes
+    """
+    start_time = time.time()
+    bucket = storage_client.bucket(bucket_name)
+
+    existing = {}
+    if skip_unchanged:
+        folders = {blob_name.rpartition("/")[0] for _, blob_name in uploads}
+        for folder in folders:
+            prefix = folder + "/" if folder else None
+            # Only list the objects directly in the folder, not the nested ones.
+            blobs = storage_client.list_blobs(bucket_name, prefix=prefix, delimiter="/")
+            for blob in blobs:
+                existing[blob.name] = blob
+
+    def upload(item):
+        source_file_name, blob_name = item
+        if blob_name in existing and is_blob_unchanged(
+            source_file_name, existing[blob_name]
+        ):
+            return False
+        upload_file_to_blob(bucket.blob(blob_name), source_file_name)
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        uploaded = list(executor.map(upload, uploads))
+    # The folder and file pickers should show the new files.
+    if any(uploaded):
+        invalidate_bucket_listing(bucket_name)
+
+    stats = {
+        "uploaded": sum(uploaded),
+        "skipped": len(uploads) - sum(uploaded),
+        "bytes": sum(
+            os.path.getsize(source_file_name)
+            for (source_file_name, _), is_uploaded in zip(uploads, uploaded)
+            if is_uploaded
+        ),
+    }
+    arcpy.AddMessage(
+        f"Uploaded {stats['uploaded']} files ({stats['bytes'] / 1024 / 1024:.1f} MB) "
+        f"to {bucket_name} and skipped {stats['skipped']} unchanged files "
+        f"in {time.time() - start_time:.1f} s."
+    )
+    return stats
+
+
+# Write the features of a feature class as CSV rows.
+def write_feature_class_csv(
+    feature_class: str,
+    stream: "io.TextIOBase",
+    geometry_format: str = "WKT",
+    batch_size: int = 10000,
+) -> int:
+    """Write the features of a feature class as CSV rows with a geometry column.
+
+    Features are read with a cursor in batches, so the feature class is never
+    held in memory. Geometries are projected to WGS 84, which Earth Engine
+    expects for CSV tables.
+
+    Args:
+        feature_class : Path to the feature class or name of the layer
+        stream : Text stream the CSV is written to
+        geometry_format : Format of the geometry column, WKT or GeoJSON. Defaults to WKT.
+        batch_size : Number of features read and written at a time. Defaults to 10000.
+
+    Returns:
+        int : Number of features written
+    """
+    desc = arcpy.Describe(feature_class)
+    # Length and area fields are in the units of the source projection.
+    skip_fields = {
+        getattr(desc, "lengthFieldName", ""),
+        getattr(desc, "areaFieldName", ""),
+    }
+    fields = [
+        field.name
+        for field in arcpy.ListFields(feature_class)
+        if field.type not in ("Geometry", "Raster", "Blob")
+        and field.name not in skip_fields
+    ]
+    geometry_token = "SHAPE@WKT" if geometry_format == "WKT" else "SHAPE@"
+
+    writer = csv.writer(stream)
+    writer.writerow(fields + [FEATURE_CSV_GEOMETRY_COLUMN])
+    count = 0
+    with arcpy.da.SearchCursor(
+        feature_class,
+        fields + [geometry_token],
+        spatial_reference=arcpy.SpatialReference(4326),
+    ) as cursor:
+        while True:
+            batch = list(itertools.islice(cursor, batch_size))
+            if not batch:
+                break
+            rows = []
+            for row in batch:
+                values = [
+                    value.isoformat() if isinstance(value, datetime.datetime) else value
+                    for value in row[:-1]
+                ]
+                geometry = row[-1]
+                if geometry is not None and geometry_format != "WKT":
+                    geometry = json.dumps(geometry.__geo_interface__)
+                rows.append(values + [geometry])
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+# Upload a feature class to Google Cloud Storage as a single table file.
+def upload_feature_class_to_gcs(
+    storage_client: "google.cloud.storage.Client",
+    bucket_name: str,
+    blob_name: str,
+    feature_class: str,
+    geometry_format: str = "WKT",
+    batch_size: int = 10000,
+) -> int:
+    """Stream a feature class into one Google Cloud Storage object for table ingestion.
+
+    A blob name ending with .zip is written as a zipped shapefile. Otherwise
+    the features are written as a plain CSV file while they are read.
+
+    Args:
+        storage_client : Storage client instance
+        bucket_name : Name of the GCS bucket
+        blob_name : Destination path in GCS bucket
+        feature_class : Path to the feature class or name of the layer
+        geometry_format : Format of the CSV geometry column, WKT or GeoJSON. Defaults to WKT.
+        batch_size : Number of features read and written at a time. Defaults to 10000.
+
+    Returns:
+        int : Number of features uploaded, or None for a zipped shapefile
+    """
+    start_time = time.time()
+    blob = storage_client.bucket(bucket_name).blob(blob_name)
+    count = None
+    if blob_name.endswith(".zip"):
+        # A shapefile is written by ArcGIS as several files, so it is exported
+        # to a temporary folder and only the zip file is streamed.
+        tmp_dir = tempfile.mkdtemp(prefix="arcgee_shp_")
+        try:
+            shapefile = os.path.join(tmp_dir, pathlib.Path(blob_name).stem + ".shp")
+            arcpy.conversion.ExportFeatures(feature_class, shapefile)
+            with blob.open(
+                "wb", content_type="application/zip", ignore_flush=True
+            ) as writer:
+                with zipfile.ZipFile(writer, "w", zipfile.ZIP_DEFLATED) as archive:
+                    for path in sorted(pathlib.Path(tmp_dir).iterdir()):
+                        archive.write(path, path.name)
+                size = writer.tell()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    else:
+        # The CSV file is stored as it is, since table ingestion does not
+        # document support for gzip content encoding.
+        with blob.open("wb", content_type="text/csv", ignore_flush=True) as writer:
+            text = io.TextIOWrapper(writer, encoding="utf-8", newline="")
+            count = write_feature_class_csv(
+                feature_class, text, geometry_format, batch_size
+            )
+            text.flush()
+            size = writer.tell()
+            # Keep the writer open, so it is closed once by the with statement.
+            text.detach()
+
+    message = f"Uploaded {feature_class} to {bucket_name}/{blob_name}"
+    if count is not None:
+        message += f" ({count} features)"
+    arcpy.AddMessage(
+        f"{message}, {size / 1024 / 1024:.1f} MB "
+        f"in {time.time() - start_time:.1f} s."
+    )
+    invalidate_bucket_listing(bucket_name)
+    return count
+
+
 # Convert Google Cloud Storage file to Earth Engine asset.
-def gcs_file_to_ee_asset(asset_type: str, asset_id: str, bucket_uri: str) -> None:
+def gcs_file_to_ee_asset(asset_type: str, asset_id: str, bucket_uri: str) -> str:
     """Convert a Google Cloud Storage file to an Earth Engine asset.
 
     Args:
         asset_type : Type of Earth Engine asset to create
         asset_id : ID for the new Earth Engine asset
         bucket_uri : URI of the file in Google Cloud Storage
+
+    Returns:
+        str : ID of the ingestion task, or None if the task could not be started
     """
-    import subprocess
-
-    arcpy.AddMessage("Convert Google Cloud Storage file to Earth Engine asset ...")
-    arcpy.AddMessage("Upload " + bucket_uri + " to " + asset_id)
-    # Define the Earth Engine CLI command.
-    command = [
-        "earthengine",
-        "upload",
-        asset_type,
-        "--asset_id=" + asset_id,
-        bucket_uri,
-    ]
+    return gcs_files_to_ee_assets([(asset_type, asset_id, bucket_uri)])[0]
 
-    # Run the command.
-    try:
-        process = subprocess.run(
-            command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+
+def get_ingestion_manifest(
+    asset_type: str, asset_id: str, bucket_uri: str, source_options: dict = None
+) -> dict:
+    """Build the ingestion manifest of a Google Cloud Storage file.
+
+    The manifest is the same as the one built by the earthengine upload command.
+
+    Args:
+        asset_type : Type of Earth Engine asset to create, image or table
+        asset_id : ID for the new Earth Engine asset
+        bucket_uri : URI of the file in Google Cloud Storage
+        source_options : Additional table source options, such as primaryGeometryColumn. Defaults to None.
+
+    Returns:
+        dict : The image or table manifest
+    """
+    name = ee.data.convert_asset_id_to_asset_name(asset_id)
+    if asset_type == "image":
+        return {
+            "name": name,
+            "tilesets": [{"id": "ts", "sources": [{"uris": [bucket_uri]}]}],
+        }
+    return {"name": name, "sources": [{"uris": [bucket_uri], **(source_options or {})}]}
+
+
+def gcs_files_to_ee_assets(files: list[tuple], max_workers: int = 8) -> list[str]:
+    """Start ingestion tasks for Google Cloud Storage files in this process.
+
+    The tasks are started concurrently, and the function returns as soon as
+    all of them are submitted, without waiting for the ingestion to finish.
+
+    Args:
+        files : Asset type, asset ID and Google Cloud Storage URI of each file, optionally followed by table source options
+        max_workers : Maximum number of tasks started at the same time. Defaults to 8.
+
+    Returns:
+        list : ID of the ingestion task of each file, or None if the task could not be started
+    """
+    arcpy.AddMessage("Convert Google Cloud Storage files to Earth Engine assets ...")
+    # Request IDs make the ingestion requests safe to retry.
+    request_ids = ee.data.newTaskId(len(files))
+
+    def start(item):
+        (asset_type, asset_id, bucket_uri, *source_options), request_id = item
+        # Ingestion fails when the parent folder is missing.
+        ensure_asset_path(asset_id.rstrip("/").rpartition("/")[0], "FOLDER")
+        manifest = get_ingestion_manifest(
+            asset_type, asset_id, bucket_uri, *source_options
         )
-        arcpy.AddMessage(process.stdout.decode("utf-8"))
-    except subprocess.CalledProcessError as e:
-        arcpy.AddError(e.stderr.decode("utf-8"))
-    # ArcGIS Pro imposes certain restrictions on running subprocesses.
-    # Return PermissionError if the command is not allowed to run.
-    except PermissionError as e:
-        arcpy.AddError(f"Permission error: {e}")
+        if asset_type == "image":
+            return ee.data.startIngestion(request_id, manifest)["id"]
+        return ee.data.startTableIngestion(request_id, manifest)["id"]
+
+    def try_start(item):
+        try:
+            return start(item), None
+        except ee.EEException as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(try_start, zip(files, request_ids)))
+
+    task_ids = []
+    for (_, asset_id, bucket_uri, *_), (task_id, error) in zip(files, results):
+        if error is not None:
+            arcpy.AddError(f"Failed to upload {bucket_uri} to {asset_id}: {error}")
+        else:
+            arcpy.AddMessage(
+                f"Started upload task {task_id}: {bucket_uri} to {asset_id}"
+            )
+        task_ids.append(task_id)
+    return task_ids
 
 
 # Create an Earth Engine image collection.
@@ -1636,24 +3153,8 @@ def create_image_collection(asset_folder: str) -> None:
     Args:
         asset_folder : Path where the image collection will be created
     """
-    import subprocess
-
     arcpy.AddMessage("Create an Earth Engine image collection ...")
-    # Define the Earth Engine CLI command.
-    command = [
-        "earthengine",
-        "create",
-        "collection",
-        asset_folder,
-    ]
-
-    # Run the command.
-    process = subprocess.run(
-        command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
-
-    # Output the result.
-    arcpy.AddMessage(process.stdout.decode("utf-8"))
+    ensure_asset_path(asset_folder, "IMAGE_COLLECTION")
 
 
 # Create a folder on Earth Engine.
@@ -1663,24 +3164,90 @@ def create_ee_folder(asset_folder: str) -> None:
     Args:
         asset_folder : Path where the folder will be created
     """
-    import subprocess
-
     arcpy.AddMessage("Create an Earth Engine folder ...")
-    # Define the Earth Engine CLI command.
-    command = [
-        "earthengine",
-        "create",
-        "folder",
-        asset_folder,
-    ]
+    ensure_asset_path(asset_folder, "FOLDER")
 
-    # Run the command.
-    process = subprocess.run(
-        command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
 
-    # Output the result.
-    arcpy.AddMessage(process.stdout.decode("utf-8"))
+# Split an asset ID into its root and folder names.
+def split_asset_path(asset_id: str) -> tuple[str, list[str]]:
+    """Split an asset ID into its root and the folder names below the root.
+
+    Args:
+        asset_id : ID of the Earth Engine asset
+
+    Returns:
+        tuple : The root asset name, such as projects/my-project/assets, and the names of the assets below it
+    """
+    name = ee.data.convert_asset_id_to_asset_name(asset_id.rstrip("/"))
+    project, _, path = name.partition("/assets/")
+    root = project + "/assets"
+    parts = [part for part in path.split("/") if part]
+    # Legacy assets are rooted at users/<name> or projects/<name>.
+    if project == "projects/earthengine-legacy":
+        root = "/".join([root] + parts[:2])
+        parts = parts[2:]
+    return root, parts
+
+
+# Make sure an asset folder or image collection exists.
+def ensure_asset_path(asset_id: str, asset_type: str = "FOLDER") -> bool:
+    """Create an asset folder or image collection with all missing parent folders.
+
+    Paths verified or created before in the session are not checked again, so
+    the function can be called for every file of a parallel upload or export.
+    Otherwise the asset itself is looked up first, and when it is missing each
+    level of its path is listed once, from the root down, until the first
+    missing level. From there every level is created without listing.
+
+    Args:
+        asset_id : ID of the folder or image collection
+        asset_type : Type of the final asset, FOLDER or IMAGE_COLLECTION. Defaults to FOLDER.
+
+    Returns:
+        bool : True if the asset was created, False if it already existed
+    """
+    root, parts = split_asset_path(asset_id)
+    names = [root + "/" + "/".join(parts[: i + 1]) for i in range(len(parts))]
+    if not names or names[-1] in _verified_assets:
+        return False
+
+    with _asset_path_lock:
+        # Another thread may have created the path while this one waited.
+        if names[-1] in _verified_assets:
+            return False
+        try:
+            _verified_assets[names[-1]] = ee.data.getAsset(names[-1])["type"]
+            _verified_assets.update(dict.fromkeys(names[:-1], "FOLDER"))
+            return False
+        except ee.EEException:
+            pass
+
+        missing = False
+        parent = root
+        for i, name in enumerate(names):
+            if name in _verified_assets:
+                parent = name
+                continue
+            if not missing:
+                # List the parent once and remember all of its children.
+                children = ee.data.listAssets({"parent": parent}).get("assets", [])
+                for child in children:
+                    _verified_assets.setdefault(child["name"], child["type"])
+                missing = name not in _verified_assets
+            if missing:
+                create_type = asset_type if i == len(names) - 1 else "FOLDER"
+                try:
+                    ee.data.createAsset({"type": create_type}, name)
+                    arcpy.AddMessage(
+                        f"Created {create_type.lower().replace('_', ' ')} {name}"
+                    )
+                except ee.EEException as e:
+                    # Another process may have created it in the meantime.
+                    if "already exists" not in str(e).lower():
+                        raise
+                _verified_assets[name] = create_type
+            parent = name
+        return missing
 
 
 # Check if an Earth Engine asset already exists.
@@ -1693,6 +3260,8 @@ def asset_exists(asset_id: str) -> bool:
     Returns:
         bool : True if asset exists, False otherwise
     """
+    if ee.data.convert_asset_id_to_asset_name(asset_id) in _verified_assets:
+        return True
     try:
         # Try to retrieve asset information.
         ee.data.getAsset(asset_id)
@@ -1702,6 +3271,133 @@ def asset_exists(asset_id: str) -> bool:
         return False
 
 
+class BucketListing:
+    """Folders and files of a Google Cloud Storage bucket from one flat listing."""
+
+    def __init__(self, blob_names: list[str]) -> None:
+        """Build the folder tree and the file index of a bucket.
+
+        Args:
+            blob_names : Names of all objects in the bucket
+        """
+        folders = set()
+        files = []
+        for name in blob_names:
+            # Every prefix ending with a slash is a folder, whether or not a
+            # placeholder object exists for it.
+            end = name.find("/")
+            while end != -1:
+                folders.add(name[: end + 1])
+                end = name.find("/", end + 1)
+            if not name.endswith("/"):
+                files.append(name)
+        self.folders = sorted(folders)
+        self.files = sorted(files)
+        self.created = time.time()
+        self.refreshing = False
+
+    @staticmethod
+    def _with_prefix(names: list[str], prefix: str) -> list[str]:
+        """Get the names in a sorted list that start with a prefix."""
+        start = bisect.bisect_left(names, prefix)
+        end = bisect.bisect_left(names, prefix + "\U0010ffff")
+        return names[start:end]
+
+    def list_folders(self, prefix: str = "") -> list[str]:
+        """List the folders below a prefix."""
+        return self._with_prefix(self.folders, prefix)
+
+    def list_files(self, prefix: str = "") -> list[str]:
+        """List the files below a prefix, including files in subfolders."""
+        return self._with_prefix(self.files, prefix)
+
+
+def list_bucket_blob_names(
+    storage_client: "google.cloud.storage.Client", bucket_name: str
+) -> list[str]:
+    """List the names of all objects in a bucket with one paged request sequence.
+
+    Args:
+        storage_client : Storage client instance
+        bucket_name : Name of the GCS bucket
+
+    Returns:
+        list: Names of all objects in the bucket
+    """
+    # Only request the object names to keep the pages small.
+    blobs = storage_client.list_blobs(
+        bucket_name, page_size=1000, fields="items(name),nextPageToken"
+    )
+    return [blob.name for blob in blobs]
+
+
+def get_bucket_listing(
+    storage_client: "google.cloud.storage.Client",
+    bucket_name: str,
+    max_age: float = BUCKET_LISTING_TTL,
+) -> BucketListing:
+    """Get the cached listing of a bucket, listing the bucket when it is not cached.
+
+    A listing older than the maximum age is returned as is while a new one is
+    listed in a background thread, so tool dialogs never wait for a refresh.
+
+    Args:
+        storage_client : Storage client instance
+        bucket_name : Name of the GCS bucket
+        max_age : Age in seconds after which the listing is refreshed. Defaults to BUCKET_LISTING_TTL.
+
+    Returns:
+        BucketListing: The folders and files of the bucket
+    """
+    with _bucket_listing_lock:
+        listing = _bucket_listings.get(bucket_name)
+        if listing is not None:
+            if time.time() - listing.created > max_age and not listing.refreshing:
+                listing.refreshing = True
+                threading.Thread(
+                    target=refresh_bucket_listing,
+                    args=(storage_client, bucket_name),
+                    daemon=True,
+                ).start()
+            return listing
+    return refresh_bucket_listing(storage_client, bucket_name)
+
+
+def refresh_bucket_listing(
+    storage_client: "google.cloud.storage.Client", bucket_name: str
+) -> BucketListing:
+    """List a bucket again and replace its cached listing.
+
+    Args:
+        storage_client : Storage client instance
+        bucket_name : Name of the GCS bucket
+
+    Returns:
+        BucketListing: The folders and files of the bucket
+    """
+    try:
+        listing = BucketListing(list_bucket_blob_names(storage_client, bucket_name))
+    except Exception:
+        # Keep serving the old listing and try again on the next request.
+        with _bucket_listing_lock:
+            if bucket_name in _bucket_listings:
+                _bucket_listings[bucket_name].refreshing = False
+        raise
+    with _bucket_listing_lock:
+        _bucket_listings[bucket_name] = listing
+    return listing
+
+
+def invalidate_bucket_listing(bucket_name: str) -> None:
+    """Drop the cached listing of a bucket after its content changed.
+
+    Args:
+        bucket_name : Name of the GCS bucket
+    """
+    with _bucket_listing_lock:
+        _bucket_listings.pop(bucket_name, None)
+
+
 # List all folders in the bucket.
 def list_folders_recursive(
     storage_client: "google.cloud.storage.Client",
@@ -1718,24 +3414,8 @@ def list_folders_recursive(
     Returns:
         list: Sorted list of folder paths in the bucket
     """
-    # List blobs with a delimiter to group them by "folders".
-    blobs = storage_client.list_blobs(bucket_name, prefix=prefix, delimiter="/")
-
-    # Need this code to active blob prefixes, otherwise, blob.prefixes are empty.
-    for blob in blobs:
-        blob_name = blob.name
-
-    folder_list = []
-    # Folders are stored in the prefixes attribute.
-    if blobs.prefixes:
-        for folder in blobs.prefixes:
-            folder_list.append(folder)
-            # Recursively call the function to go deeper into the folder.
-            folder_list.extend(
-                list_folders_recursive(storage_client, bucket_name, prefix=folder)
-            )
-
-    return sorted(folder_list)
+    listing = get_bucket_listing(storage_client, bucket_name)
+    return [folder for folder in listing.list_folders(prefix) if folder != prefix]
 
 
 # List files within a folder in the bucket.
@@ -1754,12 +3434,7 @@ def list_files_in_folder(
     Returns:
         list: List of file paths within the specified folder
     """
-    blobs = storage_client.list_blobs(bucket_name, prefix=folder_name)
-
-    # Filter out any "folders" (items ending with a trailing slash).
-    files = [blob.name for blob in blobs if not blob.name.endswith("/")]
-
-    return files
+    return get_bucket_listing(storage_client, bucket_name).list_files(folder_name)
 
 
 # Check if the start date is given when end date is provided for filter by dates.
@@ -1812,6 +3487,56 @@ def has_valid_pixels(image: "ee.Image", roi: "ee.Geometry", scale: float) -> boo
     return result_bool
 
 
+def check_valid_pixels(
+    images: list["ee.Image"],
+    roi: "ee.Geometry",
+    scale: float,
+    batch: GetInfoBatch = None,
+) -> list[bool]:
+    """Check if images have valid pixels, evaluating all images together.
+
+    Same as has_valid_pixels for each image, but the checks of all images are
+    evaluated in one request, and the retry with a larger sample in another.
+
+    Args:
+        images : Input images
+        roi : Region of interest
+        scale : Scale of the images
+        batch : Batch to evaluate the checks with. Defaults to a new batch.
+
+    Returns:
+        list: True for each image that has valid pixels, False otherwise
+    """
+    if batch is None:
+        batch = GetInfoBatch()
+    arcpy.AddMessage(
+        f"Checking if {len(images)} images have valid pixels within the region of interest ..."
+    )
+    results = [None] * len(images)
+    for num_pixels in (30, 300):
+        checks = {
+            i: batch.defer(
+                image.sample(region=roi, scale=scale, numPixels=num_pixels).size().gt(0)
+            )
+            for i, image in enumerate(images)
+            if not results[i]
+        }
+        if not checks:
+            break
+        if num_pixels == 300:
+            arcpy.AddWarning(
+                f"{len(checks)} images have no or very limited data coverage. "
+                "Please check the data coverage and adjust the region of interest. "
+                "Trying to increase the sample size to 300 ..."
+            )
+        batch.flush()
+        for i, check in checks.items():
+            result = check.result()
+            results[i] = bool(result) if result is not None else False
+
+    return results
+
+
 # Check if the JSON file is valid.
 def is_valid_json(json_file: pathlib.Path) -> bool:
     """Check if the JSON file is valid.
@@ -1880,18 +3605,32 @@ def get_band_list(image: "ee.Image") -> list[str]:
     Returns:
         list: List of band names with resolution information
     """
-    band_list = image.bandNames().getInfo()
+    band_list = cache.get_info(image.bandNames())
     # Add band resolution information to display.
     band_res_list = []
     for iband in band_list:
         band_tmp = image.select(iband)
         proj = band_tmp.projection()
-        res = proj.nominalScale().getInfo()
+        res = cache.get_info(proj.nominalScale())
         band_res_list.append(f"{iband}--{round(res, 1)}--m")
 
     return band_res_list
 
 
+def get_image_names(collection: "ee.ImageCollection", limit: int = 100) -> list[str]:
+    """Get the image IDs of a collection.
+
+    Args:
+        collection : Input image collection
+        limit : Maximum number of image IDs to return. Defaults to 100.
+
+    Returns:
+        list: List of the system:index of the images
+    """
+    collection = ee.ImageCollection(collection)
+    return cache.get_info(collection.limit(limit).aggregate_array("system:index"))
+
+
 def get_composite_by_method(
     collection: "ee.ImageCollection", method: str, percentile_value: float = None
 ) -> "ee.Image":
@@ -1936,7 +3675,7 @@ def export_image_to_asset(
     max_pixels: int = None,
     shard_size: int = None,
     priority: int = None,
-) -> None:
+) -> "ee.batch.Task":
     """Export an image to an Earth Engine asset.
 
     Args:
@@ -1952,6 +3691,9 @@ def export_image_to_asset(
         maxPixels : Max pixels
         shardSize : Shard size
         priority : Priority
+
+    Returns:
+        ee.batch.Task: The started export task
     """
     # Prepare input parameters
     in_params = {
@@ -1984,3 +3726,375 @@ def export_image_to_asset(
         **in_params,
     )
     task.start()
+    return task
+
+
+class EarthEngineTaskApi:
+    """Start export tasks and query their states with the Earth Engine API."""
+
+    # Operation states of the Cloud API mapped to the legacy task states.
+    TASK_STATES = {
+        "PENDING": "READY",
+        "RUNNING": "RUNNING",
+        "CANCELLING": "CANCEL_REQUESTED",
+        "SUCCEEDED": "COMPLETED",
+        "FAILED": "FAILED",
+        "CANCELLED": "CANCELLED",
+    }
+
+    def __init__(self, max_workers: int = 8) -> None:
+        """Create the task API.
+
+        Args:
+            max_workers : Maximum number of concurrent task status requests. Defaults to 8.
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._project_path = None
+
+    def start(self, export: dict) -> str:
+        """Start an export task.
+
+        Args:
+            export : Keyword arguments of export_image_to_asset.
+
+        Returns:
+            str : ID of the started task.
+        """
+        return export_image_to_asset(**export).id
+
+    def get_states(self, task_ids: list[str]) -> dict[str, dict]:
+        """Get the states of tasks by looking up each tracked operation.
+
+        Only the given operations are requested, concurrently, instead of
+        listing all operations of the project.
+
+        Args:
+            task_ids : IDs of the tasks.
+
+        Returns:
+            dict : Task status, with state and error_message, keyed by task ID. Tasks whose operation is not found are left out.
+        """
+        if self._project_path is None:
+            # The config name is projects/<project>/config.
+            self._project_path = ee.data.getProjectConfig()["name"].rpartition("/")[0]
+
+        def get_operation(task_id):
+            try:
+                return ee.data.getOperation(
+                    f"{self._project_path}/operations/{task_id}"
+                )
+            except ee.EEException as e:
+                # A task that was just started may not be listed yet.
+                if "not found" in str(e).lower():
+                    return None
+                raise
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            operations = list(executor.map(get_operation, task_ids))
+
+        statuses = {}
+        for task_id, operation in zip(task_ids, operations):
+            if operation is None:
+                continue
+            state = operation.get("metadata", {}).get("state")
+            statuses[task_id] = {
+                "id": task_id,
+                "state": self.TASK_STATES.get(state, "UNKNOWN"),
+                "error_message": operation.get("error", {}).get("message"),
+            }
+        return statuses
+
+    def get_existing_assets(self, asset_ids: list[str]) -> set[str]:
+        """Get the assets that exist, listing each parent folder or collection once.
+
+        Args:
+            asset_ids : IDs of the assets.
+
+        Returns:
+            set : IDs of the assets that exist.
+        """
+        parents = {}
+        for asset_id in asset_ids:
+            name = ee.data.convert_asset_id_to_asset_name(asset_id.rstrip("/"))
+            parents.setdefault(name.rpartition("/")[0], {})[name] = asset_id
+        existing = set()
+        for parent, names in parents.items():
+            try:
+                children = ee.data.listAssets({"parent": parent}).get("assets", [])
+            except ee.EEException:
+                # The parent was deleted.
+                continue
+            for child in children:
+                if child["name"] in names:
+                    existing.add(names[child["name"]])
+        return existing
+
+
+class ExportOrchestrator:
+    """Submit export tasks with a cap on running tasks and track them in a ledger.
+
+    The ledger is a JSON file with the task ID, state and export hash of each
+    export keyed by asset ID. The export hash covers the image expression and
+    all export parameters. When the same exports run again, completed exports
+    whose asset still exists are skipped, tasks that are still running are
+    monitored instead of being submitted again, and failed, cancelled or
+    changed exports are submitted again.
+    """
+
+    # Task states that are final, and states of tasks that are still running.
+    DONE_STATES = ("COMPLETED", "FAILED", "CANCELLED", "UNKNOWN")
+    ACTIVE_STATES = ("SUBMITTED", "READY", "RUNNING", "CANCEL_REQUESTED")
+
+    # Finished entries older than this many seconds are dropped from the ledger.
+    MAX_ENTRY_AGE = 30 * 24 * 60 * 60
+
+    # Submitted tasks without a status are considered running for this many
+    # seconds, since a new operation is not found right away.
+    MISSING_TASK_GRACE = 10 * 60
+
+    def __init__(
+        self,
+        ledger_path: str,
+        task_api: EarthEngineTaskApi = None,
+        max_running: int = 10,
+        max_workers: int = 4,
+        poll_interval: float = 5,
+        max_poll_interval: float = 60,
+        max_poll_failures: int = 5,
+    ) -> None:
+        """Create the orchestrator and load the ledger of earlier runs.
+
+        Args:
+            ledger_path : Path to the JSON task ledger.
+            task_api : API to start tasks and get their states. Defaults to the Earth Engine API.
+            max_running : Maximum number of submitted tasks that are not finished yet. Defaults to 10.
+            max_workers : Maximum number of tasks submitted concurrently. Defaults to 4.
+            poll_interval : Initial wait between task status polls in seconds. Defaults to 5.
+            max_poll_interval : Maximum wait between task status polls in seconds. Defaults to 60.
+            max_poll_failures : Number of failed status polls in a row after which monitoring stops. Defaults to 5.
+        """
+        self.ledger_path = pathlib.Path(ledger_path)
+        self.task_api = task_api if task_api is not None else EarthEngineTaskApi()
+        self.max_running = max(1, int(max_running))
+        self.max_workers = max(1, int(max_workers))
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_poll_failures = max(1, int(max_poll_failures))
+        self.poll_failures = 0
+        self.ledger = {}
+        if self.ledger_path.exists():
+            try:
+                self.ledger = json.loads(self.ledger_path.read_text())
+            except ValueError:
+                arcpy.AddWarning(f"Ignoring the unreadable task ledger {ledger_path}.")
+        expired = time.time() - self.MAX_ENTRY_AGE
+        self.ledger = {
+            asset_id: entry
+            for asset_id, entry in self.ledger.items()
+            if entry.get("state") in self.ACTIVE_STATES
+            or entry.get("updated", 0) > expired
+        }
+
+    def _save_ledger(self) -> None:
+        """Write the ledger to a temporary file first so it is never left partial."""
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.ledger_path.with_name(self.ledger_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.ledger, indent=2))
+        os.replace(tmp_path, self.ledger_path)
+
+    def _update(self, asset_id: str, **entry) -> None:
+        self.ledger.setdefault(asset_id, {}).update(entry, updated=time.time())
+
+    def _running(self) -> list[str]:
+        return [
+            asset_id
+            for asset_id, entry in self.ledger.items()
+            if entry.get("state") in self.ACTIVE_STATES
+        ]
+
+    def _submit(self, exports: list[dict]) -> None:
+        """Start export tasks concurrently and record them in the ledger."""
+
+        def start(export):
+            try:
+                return self.task_api.start(export), None
+            except Exception as e:
+                return None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(start, exports))
+
+        for export, (task_id, error) in zip(exports, results):
+            asset_id = export["asset_id"]
+            export_hash = get_export_hash(export)
+            if error is not None:
+                arcpy.AddWarning(f"Failed to export {asset_id}: {error}")
+                self._update(
+                    asset_id,
+                    task_id=None,
+                    state="FAILED",
+                    error=str(error),
+                    export_hash=export_hash,
+                )
+            else:
+                arcpy.AddMessage(f"Exporting {asset_id} (task {task_id}) ...")
+                self._update(
+                    asset_id,
+                    task_id=task_id,
+                    state="SUBMITTED",
+                    error=None,
+                    export_hash=export_hash,
+                    submitted=time.time(),
+                )
+        self._save_ledger()
+
+    def _poll(self) -> bool:
+        """Update the states of running tasks.
+
+        Returns:
+            bool : Whether any task changed its state.
+        """
+        running = self._running()
+        if not running:
+            return False
+        task_ids = {self.ledger[asset_id]["task_id"]: asset_id for asset_id in running}
+        try:
+            statuses = self.task_api.get_states(list(task_ids))
+        except Exception as e:
+            self.poll_failures += 1
+            arcpy.AddWarning(f"Failed to get the task states, retrying later: {e}")
+            return False
+        self.poll_failures = 0
+
+        changed = False
+        for task_id, asset_id in task_ids.items():
+            status = statuses.get(task_id)
+            if status is None:
+                submitted = self.ledger[asset_id].get("submitted", 0)
+                if time.time() - submitted < self.MISSING_TASK_GRACE:
+                    continue
+                status = {}
+            state = status.get("state", "UNKNOWN")
+            if state == self.ledger[asset_id]["state"]:
+                continue
+            changed = True
+            self._update(asset_id, state=state, error=status.get("error_message"))
+            if state == "COMPLETED":
+                arcpy.AddMessage(f"Exported {asset_id}.")
+            elif state in self.DONE_STATES:
+                arcpy.AddWarning(
+                    f"Export of {asset_id} ended with state {state}: "
+                    f"{status.get('error_message', '')}"
+                )
+        if changed:
+            self._save_ledger()
+        return changed
+
+    def run(self, exports: list[dict], wait: bool = False) -> dict[str, str]:
+        """Submit exports that are not completed or running yet and monitor them.
+
+        Args:
+            exports : Keyword arguments of export_image_to_asset for each export.
+            wait : Whether to wait until all tasks finish. Otherwise return once all tasks are submitted. Defaults to False.
+
+        Returns:
+            dict : Task state keyed by asset ID.
+        """
+        # Refresh the states of tasks from earlier runs.
+        self._poll()
+        export_hashes = [get_export_hash(export) for export in exports]
+        unchanged = [
+            export["asset_id"]
+            for export, export_hash in zip(exports, export_hashes)
+            if self.ledger.get(export["asset_id"], {}).get("export_hash") == export_hash
+        ]
+        # Completed exports are only skipped while their asset still exists.
+        completed = [
+            asset_id
+            for asset_id in unchanged
+            if self.ledger[asset_id].get("state") == "COMPLETED"
+        ]
+        existing = self.task_api.get_existing_assets(completed) if completed else set()
+        unchanged = set(unchanged)
+
+        pending = []
+        for export in exports:
+            asset_id = export["asset_id"]
+            state = self.ledger.get(asset_id, {}).get("state")
+            if state == "COMPLETED" and asset_id in existing:
+                arcpy.AddMessage(f"Skipping {asset_id}, already exported.")
+            elif state in self.ACTIVE_STATES and asset_id in unchanged:
+                arcpy.AddMessage(f"Export of {asset_id} is still {state}.")
+            else:
+                if state in self.ACTIVE_STATES:
+                    arcpy.AddWarning(
+                        f"A different export to {asset_id} is still {state}."
+                    )
+                pending.append(export)
+
+        interval = self.poll_interval
+        while pending or (wait and self._running()):
+            if self.poll_failures >= self.max_poll_failures:
+                arcpy.AddError(
+                    f"Stopped after {self.poll_failures} failed task status "
+                    "requests in a row. Run the tool again to resume the exports."
+                )
+                break
+            capacity = self.max_running - len(self._running())
+            if pending and capacity > 0:
+                self._submit(pending[:capacity])
+                pending = pending[capacity:]
+                interval = self.poll_interval
+                continue
+            # Back off while no task changes its state.
+            time.sleep(interval)
+            if self._poll():
+                interval = self.poll_interval
+            else:
+                interval = min(interval * 2, self.max_poll_interval)
+
+        states = {
+            export["asset_id"]: self.ledger.get(export["asset_id"], {}).get(
+                "state", "NOT_SUBMITTED"
+            )
+            for export in exports
+        }
+        counts = {}
+        for state in states.values():
+            counts[state] = counts.get(state, 0) + 1
+        arcpy.AddMessage(
+            "Export tasks: "
+            + ", ".join(f"{count} {state.lower()}" for state, count in counts.items())
+            + f". Task ledger: {self.ledger_path}"
+        )
+        return states
+
+
+def get_export_hash(export: dict) -> str:
+    """Get a hash of an export that changes with the image expression or any parameter.
+
+    Args:
+        export : Keyword arguments of export_image_to_asset.
+
+    Returns:
+        str : The SHA-1 hash of the serialized export.
+    """
+    values = {
+        key: value.serialize() if isinstance(value, ee.ComputedObject) else value
+        for key, value in export.items()
+    }
+    content = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def get_export_ledger_path(asset_id: str) -> pathlib.Path:
+    """Get the default task ledger path of exports to an asset.
+
+    Args:
+        asset_id : ID of the exported image or image collection.
+
+    Returns:
+        pathlib.Path : Path to the ledger in the temp directory.
+    """
+    key = hashlib.sha1(asset_id.rstrip("/").encode("utf-8")).hexdigest()[:16]
+    return pathlib.Path(tempfile.gettempdir()) / "arcgee_exports" / f"{key}.json"
@@ -12,11 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
 import arcpy
 import ee
 import matplotlib.colors as mcolors
 import matplotlib.cm as cm
 from arcgee import data
+from arcgee import tiles
+
+
+# Auto stretch results keyed by image expression, region, bands and percentiles.
+_auto_stretch_cache: dict = {}
+
+# Tile prefetcher and view width used when map tools add layers.
+_view_prefetch: dict = {}
+
+# Map tile URLs and their creation time keyed by expression and vis params.
+_map_id_cache: dict = {}
+
+# Map IDs expire on the server after about 4 hours. A map ID is only reused
+# while at least 1 hour of it is left, so a new layer keeps working a while.
+MAP_ID_TTL = 4 * 60 * 60
+MAP_ID_REUSE_MARGIN = 60 * 60
 
 
 def list_color_ramps() -> list[str]:
@@ -54,34 +76,420 @@ def get_color_ramp(name: str, n: int = 10) -> list[str]:
         raise ValueError(f"Colormap '{name}' is not recognized by Matplotlib.")
 
 
+def get_auto_stretch_vis_params(
+    image: "ee.Image",
+    vis_params: dict,
+    region: "ee.Geometry" = None,
+    percentiles: tuple[float, float] = (2, 98),
+    grid_size: int = 256,
+) -> dict:
+    """Fill in min and max visualization values from per-band percentiles.
+
+    The percentiles are computed by a single reduceRegion over the region at a
+    scale coarsened so that the region spans about grid_size pixels per side.
+    Results are cached per image expression and region.
+
+    Args:
+        image : Earth Engine image to visualize.
+        vis_params : Visualization parameters, user-specified min/max are kept.
+        region : Region for the statistics. Defaults to the current map extent.
+        percentiles : Lower and upper percentiles for the stretch. Defaults to (2, 98).
+        grid_size : Approximate number of pixels per side of the region.
+
+    Returns:
+        dict : A copy of vis_params with min and max filled in.
+    """
+    vis_params = dict(vis_params)
+    if "min" in vis_params and "max" in vis_params:
+        return vis_params
+
+    if region is None:
+        xmin, ymin, xmax, ymax = get_map_view_extent()
+        region = ee.Geometry.BBox(xmin, ymin, xmax, ymax)
+
+    low, high = percentiles
+    bands = vis_params.get("bands")
+    cache_key = (
+        data.get_expression_hash(image),
+        data.get_expression_hash(region),
+        tuple(bands) if bands else None,
+        (low, high),
+    )
+
+    if cache_key not in _auto_stretch_cache:
+        arcpy.AddMessage("Computing auto stretch from the image histogram ...")
+        # The visualized bands are the selected bands or the first three bands.
+        band_names = ee.List(bands) if bands else image.bandNames().slice(0, 3)
+        # Coarsen the scale so the region is covered by about grid_size pixels per side.
+        scale = ee.Number(region.area(1)).sqrt().divide(grid_size).max(1)
+        stats = image.select(band_names).reduceRegion(
+            reducer=ee.Reducer.percentile([low, high]),
+            geometry=region,
+            scale=scale,
+            bestEffort=True,
+            maxPixels=1e7,
+        )
+        # Evaluate band names and statistics in a single round trip.
+        _auto_stretch_cache[cache_key] = ee.Dictionary(
+            {"bands": band_names, "stats": stats}
+        ).getInfo()
+    else:
+        arcpy.AddMessage("Using cached auto stretch values.")
+
+    result = _auto_stretch_cache[cache_key]
+    stats = result["stats"]
+    min_list = []
+    max_list = []
+    for band in result["bands"]:
+        # Single-band outputs may drop the band name prefix.
+        low_val = stats.get(f"{band}_p{low}", stats.get(f"p{low}"))
+        high_val = stats.get(f"{band}_p{high}", stats.get(f"p{high}"))
+        if low_val is None or high_val is None:
+            arcpy.AddWarning(
+                f"No valid pixels found for band {band} in the auto stretch region."
+            )
+            return vis_params
+        min_list.append(low_val)
+        max_list.append(high_val)
+
+    if "min" not in vis_params:
+        vis_params["min"] = min_list[0] if len(min_list) == 1 else min_list
+    if "max" not in vis_params:
+        vis_params["max"] = max_list[0] if len(max_list) == 1 else max_list
+    arcpy.AddMessage(f"Auto stretch: min={vis_params['min']}, max={vis_params['max']}")
+
+    return vis_params
+
+
 def add_ee_layer_to_map(
     ee_object: "ee.Image | ee.FeatureCollection",
     vis_params: dict,
     asset_id: str,
+    zoom: bool = True,
+    zoom_bounds_only: bool = True,
 ) -> None:
     """Add an Earth Engine object to the current map view.
     Args:
         ee_object : Earth Engine object to add.
         vis_params : Visualization parameters for the Earth Engine object.
         asset_id : Asset ID of the Earth Engine object.
+        zoom : Whether to zoom to the object after adding it.
+        zoom_bounds_only : Zoom with the bounds only, skipping the centroid computation.
     """
-    arcpy.AddMessage("Constructing map URL ...")
-    map_id_dict = ee_object.getMapId(vis_params)
-    map_url = map_id_dict["tile_fetcher"].url_format
+    map_url = get_map_url(ee_object, vis_params)
+
+    # Serve the tiles through the local tile cache if it is running.
+    tile_proxy = tiles.get_tile_proxy()
+    if tile_proxy is not None:
+        map_url = tile_proxy.register(
+            map_url, get_layer_resolver(ee_object, vis_params)
+        )
+        map_keys = [tile_proxy.get_layer_key(map_url)]
 
     aprx = arcpy.mp.ArcGISProject("CURRENT")
     aprxMap = aprx.activeMap
     arcpy.AddMessage(f"Adding the layer to the current ArcMap: {aprxMap.name}")
     layer = aprxMap.addDataFromPath(map_url)
-    # Add band information to layer name if specified.
+    layer.name = get_layer_name(asset_id, vis_params)
+
+    # Zoom to image extent if provided by dataset.
+    if zoom:
+        zoom_to_object(aprx, ee_object, zoom_bounds_only)
+
+    if tile_proxy is not None:
+        prefetch_map_view(map_keys=map_keys)
+        report_tile_cache_stats()
+
+
+def add_ee_layers_to_map(
+    layers: list[tuple["ee.Image | ee.FeatureCollection", dict, str]],
+    zoom: bool = True,
+    max_workers: int = 8,
+) -> None:
+    """Add several Earth Engine objects to the current map view at once.
+
+    Map IDs and bounds of all objects are requested concurrently on a thread
+    pool. The layers are then added in order and the view zooms once to the
+    combined extent.
+
+    Args:
+        layers : List of (ee_object, vis_params, asset_id) tuples.
+        zoom : Whether to zoom to the combined extent of the objects.
+        max_workers : Maximum number of concurrent Earth Engine requests.
+    """
+    arcpy.AddMessage(f"Constructing map URLs for {len(layers)} layers ...")
+
+    def get_map_url_and_bounds(layer):
+        ee_object, vis_params, _ = layer
+        map_url = get_map_url(ee_object, vis_params, verbose=False)
+        bounds_coords = None
+        if zoom:
+            try:
+                _, bounds_coords = data.get_object_centroid(ee_object, 1, True)
+            except Exception:
+                bounds_coords = None
+        return map_url, bounds_coords
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        results = list(executor.map(get_map_url_and_bounds, layers))
+
+    aprx = arcpy.mp.ArcGISProject("CURRENT")
+    aprxMap = aprx.activeMap
+    arcpy.AddMessage(f"Adding the layers to the current ArcMap: {aprxMap.name}")
+    tile_proxy = tiles.get_tile_proxy()
+    map_keys = []
+    for (ee_object, vis_params, asset_id), (map_url, _) in zip(layers, results):
+        # Serve the tiles through the local tile cache if it is running.
+        if tile_proxy is not None:
+            map_url = tile_proxy.register(
+                map_url, get_layer_resolver(ee_object, vis_params)
+            )
+            map_keys.append(tile_proxy.get_layer_key(map_url))
+        layer = aprxMap.addDataFromPath(map_url)
+        layer.name = get_layer_name(asset_id, vis_params)
+
+    # Zoom once to the combined extent of all objects.
+    bounds_list = [bounds for _, bounds in results if bounds is not None]
+    if zoom and bounds_list:
+        bboxes = [data.convert_coords_to_bbox(bounds) for bounds in bounds_list]
+        x_min = min(bbox[0] for bbox in bboxes)
+        y_min = min(bbox[1] for bbox in bboxes)
+        x_max = max(bbox[2] for bbox in bboxes)
+        y_max = max(bbox[3] for bbox in bboxes)
+        extent_coords = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+        if data.is_global_extent(extent_coords):
+            arcpy.AddMessage("The datasets have global extent, skipping zoom.")
+        else:
+            centroid_coords = [(x_min + x_max) / 2, (y_min + y_max) / 2]
+            zoom_to_point(aprx, centroid_coords, extent_coords)
+    elif zoom:
+        arcpy.AddWarning(
+            "Automatic zoom to the Earth Engine objects failed. Please zoom manually."
+        )
+
+    if tile_proxy is not None:
+        prefetch_map_view(map_keys=map_keys)
+        report_tile_cache_stats()
+
+
+def add_ee_time_layers_to_map(
+    collection: "ee.ImageCollection",
+    vis_params: dict,
+    asset_id: str,
+    max_steps: int = 500,
+) -> None:
+    """Add the time steps of an image collection as a group of map layers.
+
+    The dates of all time steps are fetched in a single request, but no map ID
+    is generated up front. Each layer is served through the local tile cache,
+    which requests the map ID of a time step when its first tile is shown.
+    Only the first time step is visible after adding the group, the other
+    steps are kept on hold in the tile cache until they are hidden, so they
+    never request a map ID before they are shown.
+
+    Args:
+        collection : Image collection with one image per time step.
+        vis_params : Visualization parameters for the images.
+        asset_id : Asset ID of the collection, used for the layer names.
+        max_steps : Maximum number of time steps to add. Defaults to 500.
+    """
+    arcpy.AddMessage("Registering the time steps of the image collection ...")
+    # Images without a time stamp are skipped, so both arrays have the same order.
+    collection = collection.filter(ee.Filter.notNull(["system:time_start"])).sort(
+        "system:time_start"
+    )
+    size = collection.size()
+    collection = collection.limit(max_steps)
+    steps = ee.Dictionary(
+        {
+            "size": size,
+            "index": collection.aggregate_array("system:index"),
+            "time": collection.aggregate_array("system:time_start"),
+        }
+    ).getInfo()
+    if not steps["index"]:
+        arcpy.AddWarning("The image collection is empty, no layers were added.")
+        return
+    if steps["size"] > max_steps:
+        arcpy.AddWarning(
+            f"The image collection has {steps['size']} time steps, only the first "
+            f"{max_steps} are added. Filter the collection by date to add later steps."
+        )
+
+    # Map IDs are generated by the tile cache when a time step is first shown.
+    tile_proxy = tiles.get_tile_proxy()
+    if tile_proxy is None:
+        arcpy.AddMessage("Starting the local tile cache for the time steps.")
+        tile_proxy = tiles.start_tile_proxy()
+
+    expression_key = data.get_expression_hash(collection)
+    vis_key = canonicalize_vis_params(vis_params)
+    aprx = arcpy.mp.ArcGISProject("CURRENT")
+    aprxMap = aprx.activeMap
+    # Group layers can only be created from ArcPy in newer ArcGIS Pro versions.
+    group = None
+    if hasattr(aprxMap, "createGroupLayer"):
+        group = aprxMap.createGroupLayer(get_layer_name(asset_id, vis_params))
+
+    arcpy.AddMessage(f"Adding {len(steps['index'])} time steps to: {aprxMap.name}")
+    held_keys = []
+    try:
+        for i, (index, time_start) in enumerate(zip(steps["index"], steps["time"])):
+            step_image = ee.Image(
+                collection.filter(ee.Filter.eq("system:index", index)).first()
+            )
+            map_key = tiles.get_map_key(f"{expression_key}/{index}/{vis_key}")
+            # Layers are added visible, so hold the later steps until they are hidden.
+            map_url = tile_proxy.register_lazy(
+                map_key, get_layer_resolver(step_image, vis_params), hold=i > 0
+            )
+            if i > 0:
+                held_keys.append(map_key)
+            else:
+                first_key = map_key
+            layer = aprxMap.addDataFromPath(map_url)
+            date_str = datetime.datetime.fromtimestamp(
+                time_start / 1000, datetime.timezone.utc
+            ).strftime("%Y-%m-%d")
+            layer.name = f"{date_str}--{index}"
+            layer.visible = i == 0
+            if group is not None:
+                aprxMap.addLayerToGroup(group, layer)
+                aprxMap.removeLayer(layer)
+    finally:
+        tile_proxy.release(held_keys)
+
+    # Zoom to the first time step, other steps share the collection filters.
+    zoom_to_object(aprx, ee.Image(collection.first()))
+    # Only the first, visible time step is prefetched, once it is resolved.
+    prefetch_map_view(map_keys=[first_key])
+
+
+def get_layer_name(asset_id: str, vis_params: dict) -> str:
+    """Get the map layer name, with band information if specified.
+
+    Args:
+        asset_id : Asset ID of the Earth Engine object.
+        vis_params : Visualization parameters for the Earth Engine object.
+
+    Returns:
+        str : The layer name.
+    """
     if vis_params.get("bands") is not None:
-        layer.name = asset_id + "--" + "--".join(vis_params.get("bands"))
-    else:
-        layer.name = asset_id
+        return asset_id + "--" + "--".join(vis_params.get("bands"))
+    return asset_id
+
+
+def canonicalize_vis_params(vis_params: dict) -> str:
+    """Get a canonical string of visualization parameters for cache keys.
+
+    Keys are sorted and numbers are converted to floats, so that equivalent
+    parameters such as {"min": 0} and {"min": 0.0} give the same string.
+
+    Args:
+        vis_params : Visualization parameters.
 
-    # Zoom to image centroid if provided by dataset.
+    Returns:
+        str : The canonical JSON string.
+    """
+
+    def normalize(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, (list, tuple)):
+            return [normalize(item) for item in value]
+        if isinstance(value, dict):
+            return {key: normalize(item) for key, item in value.items()}
+        return value
+
+    return json.dumps(normalize(vis_params), sort_keys=True, default=str)
+
+
+def get_map_url(
+    ee_object: "ee.Image | ee.FeatureCollection",
+    vis_params: dict,
+    ttl: float = MAP_ID_TTL,
+    verbose: bool = True,
+) -> str:
+    """Get the tile URL of an Earth Engine object, reusing recent map IDs.
+
+    Args:
+        ee_object : Earth Engine object to visualize.
+        vis_params : Visualization parameters for the Earth Engine object.
+        ttl : Lifetime in seconds of a map ID. A map ID is reused while more than MAP_ID_REUSE_MARGIN of it is left, so 0 always requests a new one. Defaults to MAP_ID_TTL.
+        verbose : Whether to add tool messages, off when called from worker threads.
+
+    Returns:
+        str : Tile URL with {z}, {x} and {y} placeholders.
+    """
+    cache_key = (
+        data.get_expression_hash(ee_object),
+        canonicalize_vis_params(vis_params),
+    )
+    cached = _map_id_cache.get(cache_key)
+    if cached is not None:
+        map_url, created = cached
+        if time.time() - created < ttl - MAP_ID_REUSE_MARGIN:
+            if verbose:
+                arcpy.AddMessage("Reusing map URL ...")
+            return map_url
+        # The map ID is about to expire, request a new one.
+        _map_id_cache.pop(cache_key, None)
+
+    if verbose:
+        arcpy.AddMessage("Constructing map URL ...")
+    map_id_dict = ee_object.getMapId(vis_params)
+    map_url = map_id_dict["tile_fetcher"].url_format
+    _map_id_cache[cache_key] = (map_url, time.time())
+    return map_url
+
+
+def get_layer_resolver(
+    ee_object: "ee.Image | ee.FeatureCollection", vis_params: dict
+) -> Callable[[bool], str]:
+    """Get a function that resolves the tile URL of a layer for the tile cache.
+
+    Args:
+        ee_object : Earth Engine object of the layer.
+        vis_params : Visualization parameters for the Earth Engine object.
+
+    Returns:
+        Callable : Function returning the tile URL, with a new map ID if refresh is True.
+    """
+
+    def resolve(refresh: bool = False) -> str:
+        ttl = 0 if refresh else MAP_ID_TTL
+        return get_map_url(ee_object, vis_params, ttl=ttl, verbose=False)
+
+    return resolve
+
+
+def clear_map_id_cache() -> None:
+    """Forget all reused map IDs, e.g. after switching project or credentials."""
+    _map_id_cache.clear()
+
+
+def zoom_to_object(
+    aprx: "arcpy.mp.ArcGISProject",
+    ee_object: "ee.Image | ee.FeatureCollection",
+    bounds_only: bool = True,
+) -> None:
+    """Zoom the map view to an Earth Engine object, skipping global datasets.
+
+    Args:
+        aprx : ArcGIS Pro project object.
+        ee_object : Earth Engine object to zoom to.
+        bounds_only : Zoom to the bounds center instead of the true centroid.
+    """
     try:
-        centroid_coords, bounds_coords = data.get_object_centroid(ee_object, 1)
+        centroid_coords, bounds_coords = data.get_object_centroid(
+            ee_object, 1, bounds_only
+        )
+        if data.is_global_extent(bounds_coords):
+            arcpy.AddMessage("The dataset has global extent, skipping zoom.")
+            return
         zoom_to_point(aprx, centroid_coords, bounds_coords)
     except:
         arcpy.AddWarning(
@@ -90,6 +498,150 @@ def add_ee_layer_to_map(
         pass
 
 
+def report_tile_cache_stats() -> None:
+    """Add a tool message with the local tile cache and prefetch statistics."""
+    tile_proxy = tiles.get_tile_proxy()
+    if tile_proxy is None:
+        return
+    stats = tile_proxy.get_stats()
+    requests_total = stats["cache_hits"] + stats["cache_misses"]
+    hit_rate = stats["cache_hits"] / requests_total if requests_total else 0.0
+    arcpy.AddMessage(
+        f"Tile cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses "
+        f"({hit_rate:.0%} hit rate), "
+        f"{stats['bytes_fetched'] / 1024 / 1024:.1f} MB fetched from Earth Engine."
+    )
+    if stats["prefetch_fetched"]:
+        arcpy.AddMessage(
+            f"Tile prefetch: {stats['prefetch_fetched']} tiles "
+            f"({stats['prefetch_bytes'] / 1024 / 1024:.1f} MB) prefetched, "
+            f"{stats['prefetch_hit_rate']:.0%} of them used."
+        )
+
+
+def start_map_view_prefetch(max_workers: int = 4, view_width: int = 1024) -> None:
+    """Prefetch tiles around the map view whenever a tool adds map layers.
+
+    ArcPy can only read the map view while a tool runs, so the view is not
+    watched in the background. Instead, the tiles of the view captured by this
+    tool, for the layers of the active map, and by every tool that adds map
+    layers, for the new layers, its neighbouring tiles and the next zoom level
+    out and in are fetched into the local tile cache, cancelling the previous
+    prefetch.
+
+    Args:
+        max_workers : Maximum number of concurrent prefetch requests.
+        view_width : Approximate width of the map view in pixels.
+    """
+    tile_proxy = tiles.get_tile_proxy()
+    if tile_proxy is None:
+        arcpy.AddWarning("Tile prefetch requires the local tile cache to be running.")
+        return
+
+    stop_map_view_prefetch()
+    _view_prefetch.update(
+        {
+            "prefetcher": tiles.TilePrefetcher(tile_proxy, max_workers),
+            "view_width": view_width,
+        }
+    )
+    prefetch_map_view()
+
+
+def get_project_layer_keys(
+    aprx: "arcpy.mp.ArcGISProject", active_map_only: bool = False
+) -> set[str]:
+    """Get the tile cache keys of the map layers served by the local tile cache.
+
+    Args:
+        aprx : ArcGIS Pro project object.
+        active_map_only : Whether to only look at the layers of the active map.
+
+    Returns:
+        set : Keys of the layers whose data source is a local tile URL.
+    """
+    tile_proxy = tiles.get_tile_proxy()
+    if tile_proxy is None:
+        return set()
+    maps = [aprx.activeMap] if active_map_only else aprx.listMaps()
+    keys = set()
+    for project_map in maps:
+        if project_map is None:
+            continue
+        for layer in project_map.listLayers():
+            for attribute in ("dataSource", "connectionProperties"):
+                try:
+                    value = getattr(layer, attribute)
+                except Exception:
+                    # Not every layer type supports every property.
+                    continue
+                key = tile_proxy.get_layer_key(str(value))
+                if key is not None:
+                    keys.add(key)
+                    break
+    return keys
+
+
+def unregister_removed_layers(aprx: "arcpy.mp.ArcGISProject") -> None:
+    """Forget the layers of the local tile cache that are no longer in any map.
+
+    Nothing is forgotten if no layer of the project shows its local tile URL,
+    so layers are never dropped just because their data source is unreadable.
+
+    Args:
+        aprx : ArcGIS Pro project object.
+    """
+    tile_proxy = tiles.get_tile_proxy()
+    if tile_proxy is None:
+        return
+    project_keys = get_project_layer_keys(aprx)
+    if not project_keys:
+        return
+    removed_keys = [key for key in tile_proxy.map_keys if key not in project_keys]
+    tile_proxy.unregister(removed_keys)
+
+
+def prefetch_map_view(
+    extent: tuple[float, float, float, float] = None, map_keys: list[str] = None
+) -> None:
+    """Prefetch the tiles around the map view if prefetching is started.
+
+    Call this from tool execution only, since the map view is read with ArcPy.
+    Layers that were removed from all maps are forgotten first.
+
+    Args:
+        extent : View extent as (xmin, ymin, xmax, ymax) in longitude and latitude. Defaults to the current map view extent.
+        map_keys : Keys of the layers to prefetch, such as the layers a tool just added. Defaults to the layers of the active map.
+    """
+    if not _view_prefetch:
+        return
+    aprx = arcpy.mp.ArcGISProject("CURRENT")
+    try:
+        unregister_removed_layers(aprx)
+        if map_keys is None:
+            map_keys = get_project_layer_keys(aprx, active_map_only=True)
+    except Exception as e:
+        arcpy.AddWarning(f"Tile prefetch skipped, the map layers are unreadable: {e}")
+        return
+    if extent is None:
+        try:
+            extent = get_map_view_extent(verbose=False)
+        except Exception as e:
+            # No active map view, e.g. a layout view is open.
+            arcpy.AddWarning(f"Tile prefetch skipped, no map view extent: {e}")
+            return
+    _view_prefetch["prefetcher"].prefetch(
+        extent, _view_prefetch["view_width"], map_keys
+    )
+
+
+def stop_map_view_prefetch() -> None:
+    """Stop prefetching tiles around the map view."""
+    if _view_prefetch:
+        _view_prefetch["prefetcher"].stop()
+        _view_prefetch.clear()
+
+
 # Zoom project map view to point.
 def zoom_to_point(
     aprx: "arcpy.mp.ArcGISProject",
@@ -133,10 +685,13 @@ def zoom_to_point(
 
 
 # Get map view extent.
-def get_map_view_extent(target_epsg: int = 4326) -> tuple[float, float, float, float]:
+def get_map_view_extent(
+    target_epsg: int = 4326, verbose: bool = True
+) -> tuple[float, float, float, float]:
     """Get the current map view extent coordinates in WGS 84.
     Args:
         target_epsg : Target EPSG code for the extent coordinates.
+        verbose : Whether to add tool messages about the conversion.
     Returns:
         tuple : (xmin, ymin, xmax, ymax) coordinates in WGS 84.
     """
@@ -148,7 +703,8 @@ def get_map_view_extent(target_epsg: int = 4326) -> tuple[float, float, float, f
 
     # Extract the projection and the boundary coordinates (extent).
     spatial_ref = camera.getExtent().spatialReference
-    arcpy.AddMessage(f"The current map CRS is EPSG:{spatial_ref.factoryCode}.")
+    if verbose:
+        arcpy.AddMessage(f"The current map CRS is EPSG:{spatial_ref.factoryCode}.")
     xmin = camera.getExtent().XMin
     ymin = camera.getExtent().YMin
     xmax = camera.getExtent().XMax
@@ -161,7 +717,10 @@ def get_map_view_extent(target_epsg: int = 4326) -> tuple[float, float, float, f
     # Need to clip the map extent coordinates to valid EPSG 3857 extent.
     if spatial_ref.PCSCode == 3857:
         xmin, ymin, xmax, ymax = clip_to_epsg3857_extent(xmin, ymin, xmax, ymax)
-        arcpy.AddMessage("The map extent has been clipped to valid EPSG:3857 extent.")
+        if verbose:
+            arcpy.AddMessage(
+                "The map extent has been clipped to valid EPSG:3857 extent."
+            )
     # Check if projection code is the target EPSG code.
     # projected
     poly_prj = spatial_ref.PCSCode
@@ -171,10 +730,14 @@ def get_map_view_extent(target_epsg: int = 4326) -> tuple[float, float, float, f
     # Always using latitude and longtiude for ee.Geometry, ee will automatically transform.
     if str(poly_prj) not in "EPSG:" + str(target_epsg):
         # Convert the extent corners to target EPSG.
-        arcpy.AddMessage(f"Converting the extent corners to target EPSG:{target_epsg}.")
+        if verbose:
+            arcpy.AddMessage(
+                f"Converting the extent corners to target EPSG:{target_epsg}."
+            )
         xmin, ymin = project_to_new_sr(xmin, ymin, spatial_ref, target_epsg)
         xmax, ymax = project_to_new_sr(xmax, ymax, spatial_ref, target_epsg)
-    arcpy.AddMessage([xmin, ymin, xmax, ymax])
+    if verbose:
+        arcpy.AddMessage([xmin, ymin, xmax, ymax])
     return xmin, ymin, xmax, ymax
 
 
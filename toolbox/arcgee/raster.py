@@ -0,0 +1,221 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+
+import numpy as np
+
+# Raster conversion runs in worker processes, which import this module. Only
+# numpy and rasterio are imported here, so the workers do not load arcpy or
+# Earth Engine.
+
+# Integer data types from the smallest to the largest.
+_INTEGER_DTYPES = ("uint8", "int8", "uint16", "int16", "uint32", "int32")
+
+# Lossless compression of the optimized rasters. Earth Engine builds its own
+# pyramids during ingestion, so overviews would only add upload bytes.
+COG_OPTIONS = {
+    "compress": "deflate",
+    "predictor": "yes",
+    "blocksize": 512,
+    "overviews": "none",
+    "bigtiff": "if_safer",
+}
+
+
+# Get the smallest data type that keeps all pixel values of a raster.
+def get_lossless_dtype(src: "rasterio.DatasetReader") -> str:
+    """Get the smallest data type that holds every pixel value of a raster exactly.
+
+    Args:
+        src : Open raster dataset
+
+    Returns:
+        str : Name of the data type, which is the raster data type if no smaller one fits
+    """
+    dtype = np.dtype(src.dtypes[0])
+    if dtype.kind not in "uif" or len(set(src.dtypes)) > 1:
+        return src.dtypes[0]
+
+    low, high = np.inf, -np.inf
+    nodata = src.nodata
+    # Float rasters can become integer rasters when all values are whole
+    # numbers, and float64 rasters can become float32 rasters when no value
+    # loses precision. A NaN no data value rules out integers.
+    integral = dtype.kind != "f" or nodata is None or np.isfinite(nodata)
+    exact_float32 = dtype == np.float64
+    for _, window in src.block_windows(1):
+        data = src.read(window=window)
+        if dtype.kind == "f":
+            finite = np.isfinite(data)
+            if integral and not (finite.all() and np.array_equal(np.trunc(data), data)):
+                integral = False
+            if exact_float32 and not np.array_equal(
+                data.astype(np.float32), data, equal_nan=True
+            ):
+                exact_float32 = False
+            data = data[finite]
+        if data.size:
+            low = min(low, data.min())
+            high = max(high, data.max())
+    if nodata is not None and np.isfinite(nodata):
+        low = min(low, nodata)
+        high = max(high, nodata)
+    if low > high:
+        # No valid pixels.
+        return src.dtypes[0]
+
+    if integral:
+        for name in _INTEGER_DTYPES:
+            info = np.iinfo(name)
+            if info.min <= low and high <= info.max:
+                if np.dtype(name).itemsize <= dtype.itemsize and name != dtype.name:
+                    return name
+                break
+    if exact_float32 and (
+        nodata is None or np.isnan(nodata) or np.float32(nodata) == nodata
+    ):
+        return "float32"
+    return src.dtypes[0]
+
+
+# Check if a raster has a color map.
+def has_colormap(src: "rasterio.DatasetReader") -> bool:
+    """Check if the first band of a raster has a color map.
+
+    Args:
+        src : Open raster dataset
+
+    Returns:
+        bool : True if the first band has a color map
+    """
+    try:
+        src.colormap(1)
+        return True
+    except ValueError:
+        return False
+
+
+# Check if a raster can be written in another data type without losing metadata.
+def can_keep_raster_metadata(src: "rasterio.DatasetReader", dtype: str) -> bool:
+    """Check if the masks, color map and no data values of a raster survive a new data type.
+
+    Scales, offsets, tags and a mask shared by all bands are copied, but a
+    color map needs a Byte or UInt16 band, and GeoTIFF only stores one no data
+    value and one internal mask for all bands.
+
+    Args:
+        src : Open raster dataset
+        dtype : Name of the new data type
+
+    Returns:
+        bool : True if the raster can be written in the new data type without losing metadata
+    """
+    if dtype == src.dtypes[0]:
+        return True
+    if has_colormap(src) and dtype not in ("uint8", "uint16"):
+        return False
+    nodatavals = {
+        "nan" if value is not None and np.isnan(value) else value
+        for value in src.nodatavals
+    }
+    if len(nodatavals) > 1:
+        return False
+    mask_flags = {tuple(flags) for flags in src.mask_flag_enums}
+    if len(mask_flags) > 1:
+        # Bands with their own masks.
+        return False
+    return True
+
+
+# Convert a raster to a compressed cloud optimized GeoTIFF.
+def optimize_raster(src_path: str, out_path: str, downcast: bool = True) -> dict:
+    """Convert a raster to a tiled and compressed cloud optimized GeoTIFF.
+
+    The compression is lossless, and the data type is only reduced when every
+    pixel value fits the smaller type exactly and the masks, color map, scales,
+    offsets and no data value can be kept, so pixel values do not change.
+
+    Args:
+        src_path : Path to the source raster
+        out_path : Path to the output GeoTIFF
+        downcast : Whether to store the pixels in the smallest lossless data type. Defaults to True.
+
+    Returns:
+        dict : Size of the source and output files in bytes, data type and seconds spent
+    """
+    import rasterio
+    import rasterio.shutil
+    from rasterio.enums import MaskFlags
+
+    start_time = time.time()
+    with rasterio.open(src_path) as src:
+        dtype = get_lossless_dtype(src) if downcast else src.dtypes[0]
+        if not can_keep_raster_metadata(src, dtype):
+            dtype = src.dtypes[0]
+        if dtype == src.dtypes[0]:
+            rasterio.shutil.copy(src, out_path, driver="COG", **COG_OPTIONS)
+        else:
+            # The COG driver can only copy a dataset, so the pixels in the new
+            # data type are written to a temporary tiled GeoTIFF first.
+            tmp_path = out_path + ".tmp.tif"
+            profile = src.profile.copy()
+            profile.update(
+                driver="GTiff",
+                dtype=dtype,
+                tiled=True,
+                blockxsize=512,
+                blockysize=512,
+                compress="lzw",
+                bigtiff="if_safer",
+            )
+            profile.pop("photometric", None)
+            # Alpha bands are written with the pixels.
+            has_mask = (
+                MaskFlags.per_dataset in src.mask_flag_enums[0]
+                and MaskFlags.alpha not in src.mask_flag_enums[0]
+            )
+            try:
+                # Keep the mask inside the temporary file instead of a sidecar.
+                with rasterio.Env(GDAL_TIFF_INTERNAL_MASK=True), rasterio.open(
+                    tmp_path, "w", **profile
+                ) as dst:
+                    dst.update_tags(**src.tags())
+                    for band in src.indexes:
+                        dst.update_tags(band, **src.tags(band))
+                    dst.descriptions = src.descriptions
+                    dst.units = src.units
+                    dst.scales = src.scales
+                    dst.offsets = src.offsets
+                    dst.colorinterp = src.colorinterp
+                    if has_colormap(src):
+                        dst.write_colormap(1, src.colormap(1))
+                    for _, window in dst.block_windows(1):
+                        dst.write(src.read(window=window).astype(dtype), window=window)
+                        if has_mask:
+                            dst.write_mask(
+                                src.dataset_mask(window=window), window=window
+                            )
+                rasterio.shutil.copy(tmp_path, out_path, driver="COG", **COG_OPTIONS)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    return {
+        "source_bytes": os.path.getsize(src_path),
+        "bytes": os.path.getsize(out_path),
+        "dtype": dtype,
+        "seconds": time.time() - start_time,
+    }
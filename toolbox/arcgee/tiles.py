@@ -0,0 +1,758 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import math
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import requests
+
+
+# Running tile proxy shared by all map layers in the session.
+_tile_proxy = None
+
+# Maximum zoom level of Earth Engine map tiles.
+MAX_ZOOM = 22
+
+# Re-resolve lazily generated tile URLs after 4 hours, before the map IDs expire.
+RESOLVE_TTL = 4 * 60 * 60
+
+# Upstream responses that mean the map ID has expired or is not valid for the
+# current credentials, and the minimum time in seconds between two refreshes
+# of the tile URL of a layer.
+REFRESH_STATUS_CODES = (401, 403, 404)
+REFRESH_INTERVAL = 10 * 60
+
+
+class TileCache:
+    """Disk LRU cache of map tiles keyed by map ID, z, x and y."""
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        """Create the cache and index tiles already stored on disk.
+
+        Args:
+            cache_dir : Directory to store the tiles.
+            max_bytes : Maximum total size of the cached tiles in bytes.
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Relative tile path -> tile size, ordered from least to most recently used.
+        self._entries = collections.OrderedDict()
+        self._total_bytes = 0
+        self._load()
+
+    def _load(self) -> None:
+        """Index existing tiles, oldest first."""
+        tile_files = sorted(
+            self.cache_dir.glob("*/*/*/*.tile"), key=lambda f: f.stat().st_mtime
+        )
+        for tile_file in tile_files:
+            size = tile_file.stat().st_size
+            self._entries[tile_file.relative_to(self.cache_dir).as_posix()] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _tile_key(self, map_key: str, z: int, x: int, y: int) -> str:
+        return f"{map_key}/{z}/{x}/{y}.tile"
+
+    def contains(self, map_key: str, z: int, x: int, y: int) -> bool:
+        """Check if a tile is cached without touching its LRU position."""
+        with self._lock:
+            return self._tile_key(map_key, z, x, y) in self._entries
+
+    def get(self, map_key: str, z: int, x: int, y: int) -> "bytes | None":
+        """Get a cached tile.
+
+        Args:
+            map_key : Key of the map layer.
+            z : Zoom level.
+            x : Tile column.
+            y : Tile row.
+
+        Returns:
+            bytes | None : The tile content, or None if the tile is not cached.
+        """
+        tile_key = self._tile_key(map_key, z, x, y)
+        with self._lock:
+            if tile_key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(tile_key)
+        try:
+            content = (self.cache_dir / tile_key).read_bytes()
+        except OSError:
+            # The file was removed outside of the cache.
+            with self._lock:
+                self._total_bytes -= self._entries.pop(tile_key, 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def put(self, map_key: str, z: int, x: int, y: int, content: bytes) -> None:
+        """Store a tile and evict the least recently used tiles over the size limit.
+
+        Args:
+            map_key : Key of the map layer.
+            z : Zoom level.
+            x : Tile column.
+            y : Tile row.
+            content : The tile content.
+        """
+        tile_key = self._tile_key(map_key, z, x, y)
+        tile_path = self.cache_dir / tile_key
+        tile_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see partial tiles.
+        tmp_path = tile_path.with_name(f"{tile_path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, tile_path)
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(tile_key, 0)
+            self._entries[tile_key] = len(content)
+            self._total_bytes += len(content)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used tiles until the cache fits the size limit."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            tile_key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                (self.cache_dir / tile_key).unlink()
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached tiles in bytes."""
+        return self._total_bytes
+
+
+class _TileRequestHandler(BaseHTTPRequestHandler):
+    """Serve /<map_key>/<z>/<x>/<y> requests from the tile proxy."""
+
+    path_pattern = re.compile(r"^/(\w+)/(\d+)/(\d+)/(\d+)")
+
+    def do_GET(self) -> None:
+        match = self.path_pattern.match(self.path)
+        if not match:
+            self.send_error(404)
+            return
+        map_key = match.group(1)
+        z, x, y = (int(v) for v in match.groups()[1:])
+        # Layers on hold are not drawn yet, ask the map not to keep the error.
+        if self.server.tile_proxy.is_held(map_key):
+            self.send_response(503)
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            content = self.server.tile_proxy.get_tile(map_key, z, x, y)
+        except requests.RequestException:
+            self.send_error(502)
+            return
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", get_tile_content_type(content))
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args) -> None:
+        # Keep the ArcGIS Pro Python console quiet.
+        pass
+
+
+class TileProxy:
+    """Localhost tile server that caches Earth Engine map tiles on disk."""
+
+    def __init__(
+        self,
+        cache: TileCache,
+        max_fetches: int = 8,
+        timeout: int = 60,
+        port: int = 0,
+        max_resolved: int = 32,
+    ) -> None:
+        """Create the tile proxy.
+
+        Args:
+            cache : Tile cache to serve tiles from.
+            max_fetches : Maximum number of concurrent upstream tile requests.
+            timeout : Timeout of upstream tile requests in seconds.
+            port : Local port to listen on. Defaults to 0, a free port.
+            max_resolved : Maximum number of lazily resolved tile URLs to keep.
+        """
+        self.cache = cache
+        self.timeout = timeout
+        self.bytes_fetched = 0
+        self.prefetch_fetched = 0
+        self.prefetch_bytes = 0
+        self.prefetch_hits = 0
+        self.max_resolved = max_resolved
+        self._upstreams = {}
+        self._resolvers = {}
+        # Lazily resolved tile URLs and their time, least recently used first.
+        self._resolved = collections.OrderedDict()
+        self._resolve_locks = {}
+        self._held = set()
+        self._refreshed = {}
+        self._prefetched = set()
+        self._fetch_slots = threading.BoundedSemaphore(max_fetches)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._sessions = threading.local()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _TileRequestHandler)
+        self._server.daemon_threads = True
+        self._server.tile_proxy = self
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        """Local port the proxy listens on."""
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """Start serving tiles in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving tiles."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def register(self, url_format: str, resolver: Callable[[bool], str] = None) -> str:
+        """Register an upstream tile URL and get the local tile URL for it.
+
+        Args:
+            url_format : Upstream tile URL with {z}, {x} and {y} placeholders.
+            resolver : Function returning a new upstream tile URL, called with
+                refresh=True when the upstream rejects the current one. Defaults
+                to None, which keeps the URL for the whole session.
+
+        Returns:
+            str : Local tile URL with {z}, {x} and {y} placeholders.
+        """
+        map_key = get_map_key(url_format)
+        with self._lock:
+            self._upstreams[map_key] = url_format
+            if resolver is not None:
+                self._resolvers[map_key] = resolver
+        return f"http://127.0.0.1:{self.port}/{map_key}/{{z}}/{{x}}/{{y}}"
+
+    def register_lazy(
+        self, map_key: str, resolver: Callable[[bool], str], hold: bool = False
+    ) -> str:
+        """Register a layer whose upstream tile URL is resolved on first use.
+
+        The resolver is only called when the first tile of the layer is
+        requested, so hidden layers never create a map ID. Map layers are
+        added visible, so a layer that is hidden right after being added can
+        be put on hold until then; its tile requests fail without calling the
+        resolver until the layer is released.
+
+        Args:
+            map_key : Stable key of the layer, used for the cached tiles.
+            resolver : Function returning the upstream tile URL with {z}, {x}
+                and {y} placeholders. It is called with refresh=True when the
+                upstream rejects the previous URL.
+            hold : Whether to serve no tiles until the layer is released. Defaults to False.
+
+        Returns:
+            str : Local tile URL with {z}, {x} and {y} placeholders.
+        """
+        with self._lock:
+            self._resolvers[map_key] = resolver
+            if hold:
+                self._held.add(map_key)
+        return f"http://127.0.0.1:{self.port}/{map_key}/{{z}}/{{x}}/{{y}}"
+
+    def get_layer_key(self, url: str) -> "str | None":
+        """Get the key of a layer from a local tile URL of this proxy.
+
+        Args:
+            url : Text containing the local tile URL, such as a layer data source.
+
+        Returns:
+            str | None : The layer key, or None if the URL is not served by the proxy.
+        """
+        match = re.search(rf"//127\.0\.0\.1:{self.port}/(\w+)/", url)
+        return match.group(1) if match else None
+
+    def unregister(self, map_keys: list[str]) -> None:
+        """Forget layers that are no longer shown, so they are not prefetched.
+
+        Their cached tiles are kept on disk and served again if the same layer
+        is registered later.
+
+        Args:
+            map_keys : Keys of the layers to forget.
+        """
+        with self._lock:
+            for map_key in map_keys:
+                self._upstreams.pop(map_key, None)
+                self._resolvers.pop(map_key, None)
+                self._resolved.pop(map_key, None)
+                self._resolve_locks.pop(map_key, None)
+                self._refreshed.pop(map_key, None)
+                self._held.discard(map_key)
+
+    def release(self, map_keys: list[str]) -> None:
+        """Serve the tiles of layers registered on hold.
+
+        Args:
+            map_keys : Keys of the layers to release.
+        """
+        with self._lock:
+            self._held.difference_update(map_keys)
+
+    def is_held(self, map_key: str) -> bool:
+        """Whether a layer is on hold and serves no tiles."""
+        with self._lock:
+            return map_key in self._held
+
+    @property
+    def map_keys(self) -> list[str]:
+        """Keys of the registered layers with a known upstream tile URL.
+
+        Lazy layers are only included while their resolved URL is current, so
+        prefetching never calls a resolver.
+        """
+        now = time.time()
+        with self._lock:
+            return list(self._upstreams) + [
+                map_key
+                for map_key, (_, resolved_time) in self._resolved.items()
+                if now - resolved_time < RESOLVE_TTL
+            ]
+
+    def _get_upstream(self, map_key: str) -> "str | None":
+        """Get the upstream tile URL of a layer, resolving lazy layers."""
+        with self._lock:
+            if map_key in self._upstreams:
+                return self._upstreams[map_key]
+            if map_key not in self._resolvers:
+                return None
+            resolve_lock = self._resolve_locks.setdefault(map_key, threading.Lock())
+
+        # Resolve each layer once, concurrent tile requests wait for the result.
+        with resolve_lock:
+            with self._lock:
+                resolved = self._resolved.get(map_key)
+                if resolved is not None and time.time() - resolved[1] < RESOLVE_TTL:
+                    self._resolved.move_to_end(map_key)
+                    return resolved[0]
+                resolver = self._resolvers[map_key]
+            try:
+                url_format = resolver(False)
+            except Exception:
+                return None
+            self._set_resolved(map_key, url_format)
+            return url_format
+
+    def _set_resolved(self, map_key: str, url_format: str) -> None:
+        """Remember the resolved upstream tile URL of a lazy layer."""
+        with self._lock:
+            self._resolved[map_key] = (url_format, time.time())
+            self._resolved.move_to_end(map_key)
+            while len(self._resolved) > self.max_resolved:
+                self._resolved.popitem(last=False)
+
+    def _refresh_upstream(self, map_key: str, rejected_url: str) -> "str | None":
+        """Get a new upstream tile URL of a layer after the upstream rejected one."""
+        with self._lock:
+            resolver = self._resolvers.get(map_key)
+            if resolver is None:
+                return None
+            resolve_lock = self._resolve_locks.setdefault(map_key, threading.Lock())
+
+        with resolve_lock:
+            with self._lock:
+                if map_key in self._upstreams:
+                    current = self._upstreams[map_key]
+                else:
+                    current = self._resolved.get(map_key, (None, 0))[0]
+                # Another request refreshed the URL while this one waited.
+                if current is not None and current != rejected_url:
+                    return current
+                # Missing tiles also answer 404, so refresh a layer only
+                # once in a while.
+                if time.time() - self._refreshed.get(map_key, 0) < REFRESH_INTERVAL:
+                    return None
+                self._refreshed[map_key] = time.time()
+            try:
+                url_format = resolver(True)
+            except Exception:
+                return None
+            with self._lock:
+                if map_key in self._upstreams:
+                    self._upstreams[map_key] = url_format
+                    return url_format
+            self._set_resolved(map_key, url_format)
+            return url_format
+
+    def get_tile(self, map_key: str, z: int, x: int, y: int) -> "bytes | None":
+        """Get a tile from the cache, fetching it upstream on a miss.
+
+        Args:
+            map_key : Key of the registered map layer.
+            z : Zoom level.
+            x : Tile column.
+            y : Tile row.
+
+        Returns:
+            bytes | None : The tile content, or None if the layer is unknown or
+            the tile does not exist upstream.
+        """
+        content = self.cache.get(map_key, z, x, y)
+        if content is not None:
+            with self._lock:
+                if (map_key, z, x, y) in self._prefetched:
+                    self._prefetched.discard((map_key, z, x, y))
+                    self.prefetch_hits += 1
+            return content
+        return self._fetch_tile(map_key, z, x, y)
+
+    def prefetch_tile(self, map_key: str, z: int, x: int, y: int) -> None:
+        """Fetch a tile into the cache ahead of a request for it.
+
+        Args:
+            map_key : Key of the registered map layer.
+            z : Zoom level.
+            x : Tile column.
+            y : Tile row.
+        """
+        if self.cache.contains(map_key, z, x, y):
+            return
+        try:
+            content = self._fetch_tile(map_key, z, x, y)
+        except requests.RequestException:
+            return
+        if content is not None:
+            with self._lock:
+                self._prefetched.add((map_key, z, x, y))
+                self.prefetch_fetched += 1
+                self.prefetch_bytes += len(content)
+
+    def _fetch_tile(self, map_key: str, z: int, x: int, y: int) -> "bytes | None":
+        """Fetch a tile upstream and store it in the cache."""
+        url_format = self._get_upstream(map_key)
+        if url_format is None:
+            return None
+
+        # Only one request fetches a given tile, the others wait for the result.
+        tile_key = (map_key, z, x, y)
+        with self._lock:
+            tile_lock = self._inflight.setdefault(tile_key, threading.Lock())
+        with tile_lock:
+            try:
+                if self.cache.contains(map_key, z, x, y):
+                    return self.cache.get(map_key, z, x, y)
+                with self._fetch_slots:
+                    response = self._get_session().get(
+                        url_format.format(z=z, x=x, y=y), timeout=self.timeout
+                    )
+                # The map ID may have expired, retry once with a new one.
+                if response.status_code in REFRESH_STATUS_CODES:
+                    url_format = self._refresh_upstream(map_key, url_format)
+                    if url_format is None:
+                        return None
+                    with self._fetch_slots:
+                        response = self._get_session().get(
+                            url_format.format(z=z, x=x, y=y), timeout=self.timeout
+                        )
+                if response.status_code != 200:
+                    return None
+                content = response.content
+                self.cache.put(map_key, z, x, y, content)
+                with self._lock:
+                    self.bytes_fetched += len(content)
+                return content
+            finally:
+                with self._lock:
+                    self._inflight.pop(tile_key, None)
+
+    def get_stats(self) -> dict:
+        """Get cache and prefetch statistics of the proxy.
+
+        Returns:
+            dict : Cache hits and misses, bytes fetched upstream, tiles and bytes
+            fetched by prefetching, and the share of prefetched tiles that were used.
+        """
+        with self._lock:
+            prefetch_hit_rate = (
+                self.prefetch_hits / self.prefetch_fetched
+                if self.prefetch_fetched
+                else 0.0
+            )
+            return {
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+                "bytes_fetched": self.bytes_fetched,
+                "prefetch_fetched": self.prefetch_fetched,
+                "prefetch_bytes": self.prefetch_bytes,
+                "prefetch_hits": self.prefetch_hits,
+                "prefetch_hit_rate": prefetch_hit_rate,
+            }
+
+    def _get_session(self) -> requests.Session:
+        """Get the HTTP session of the current thread."""
+        if not hasattr(self._sessions, "session"):
+            self._sessions.session = requests.Session()
+        return self._sessions.session
+
+
+class TilePrefetcher:
+    """Warm the tile cache around a map view in the background."""
+
+    def __init__(
+        self, proxy: TileProxy, max_workers: int = 4, max_tiles: int = 256
+    ) -> None:
+        """Create the prefetcher.
+
+        Args:
+            proxy : Tile proxy to fetch the tiles through.
+            max_workers : Maximum number of concurrent prefetch requests.
+            max_tiles : Maximum number of tiles per layer for one view.
+        """
+        self.proxy = proxy
+        self.max_tiles = max_tiles
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="arcgee-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._futures = []
+
+    def prefetch(
+        self,
+        extent: tuple[float, float, float, float],
+        view_width: int = 1024,
+        map_keys: list[str] = None,
+    ) -> int:
+        """Prefetch the tiles around a view, cancelling the previous prefetch.
+
+        The tiles of the view and its neighbouring tiles are fetched first,
+        then the tiles of the next zoom level out and in.
+
+        Args:
+            extent : View extent as (xmin, ymin, xmax, ymax) in longitude and latitude.
+            view_width : Width of the view in pixels, used to find the zoom level.
+            map_keys : Keys of the layers to prefetch. Defaults to None, which means all registered layers with a known upstream tile URL.
+
+        Returns:
+            int : Number of tiles queued for prefetching.
+        """
+        xmin, ymin, xmax, ymax = extent
+        z = get_view_zoom(xmin, xmax, view_width)
+        tiles = get_extent_tiles(xmin, ymin, xmax, ymax, z, margin=1)
+        if z > 0:
+            tiles += get_extent_tiles(xmin, ymin, xmax, ymax, z - 1)
+        if z < MAX_ZOOM:
+            tiles += get_extent_tiles(xmin, ymin, xmax, ymax, z + 1)
+        tiles = tiles[: self.max_tiles]
+        # Layers without a known upstream tile URL are skipped, so prefetching
+        # never calls a resolver.
+        known_keys = self.proxy.map_keys
+        if map_keys is not None:
+            known_keys = [map_key for map_key in known_keys if map_key in map_keys]
+
+        with self._lock:
+            # A new view makes the queued tiles of the previous view obsolete.
+            self._generation += 1
+            generation = self._generation
+            for future in self._futures:
+                future.cancel()
+            self._futures = [
+                self._executor.submit(self._prefetch_tile, generation, map_key, *tile)
+                for map_key in known_keys
+                for tile in tiles
+            ]
+            return len(self._futures)
+
+    def _prefetch_tile(
+        self, generation: int, map_key: str, z: int, x: int, y: int
+    ) -> None:
+        # Skip tiles of a view that has been replaced since they were queued.
+        if generation != self._generation:
+            return
+        self.proxy.prefetch_tile(map_key, z, x, y)
+
+    def stop(self) -> None:
+        """Cancel the queued tiles and stop the prefetch workers."""
+        with self._lock:
+            self._generation += 1
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+        self._executor.shutdown(wait=False)
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> tuple[int, int]:
+    """Get the Web Mercator tile containing a point.
+
+    Args:
+        lon : Longitude of the point.
+        lat : Latitude of the point.
+        z : Zoom level.
+
+    Returns:
+        tuple : (x, y) tile column and row.
+    """
+    n = 2**z
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def get_view_zoom(xmin: float, xmax: float, view_width: int = 1024) -> int:
+    """Get the tile zoom level that matches a view extent.
+
+    Args:
+        xmin : Minimum longitude of the view.
+        xmax : Maximum longitude of the view.
+        view_width : Width of the view in pixels.
+
+    Returns:
+        int : The zoom level, between 0 and MAX_ZOOM.
+    """
+    width = max(xmax - xmin, 1e-9)
+    z = round(math.log2(360.0 * view_width / 256 / width))
+    return min(max(z, 0), MAX_ZOOM)
+
+
+def get_extent_tiles(
+    xmin: float, ymin: float, xmax: float, ymax: float, z: int, margin: int = 0
+) -> list[tuple[int, int, int]]:
+    """Get the tiles covering an extent, nearest to its center first.
+
+    Args:
+        xmin : Minimum longitude of the extent.
+        ymin : Minimum latitude of the extent.
+        xmax : Maximum longitude of the extent.
+        ymax : Maximum latitude of the extent.
+        z : Zoom level.
+        margin : Number of neighbouring tiles to add around the extent.
+
+    Returns:
+        list : List of (z, x, y) tiles.
+    """
+    n = 2**z
+    x0, y0 = lonlat_to_tile(xmin, ymax, z)
+    x1, y1 = lonlat_to_tile(xmax, ymin, z)
+    x0, y0 = max(x0 - margin, 0), max(y0 - margin, 0)
+    x1, y1 = min(x1 + margin, n - 1), min(y1 + margin, n - 1)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    tiles = [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+    return sorted(tiles, key=lambda t: abs(t[1] - cx) + abs(t[2] - cy))
+
+
+def get_map_key(url_format: str) -> str:
+    """Get the cache key of a map layer from its upstream tile URL.
+
+    Args:
+        url_format : Upstream tile URL, which contains the map ID.
+
+    Returns:
+        str : Short hex key identifying the map layer.
+    """
+    return hashlib.sha1(url_format.encode("utf-8")).hexdigest()[:16]
+
+
+def get_tile_content_type(content: bytes) -> str:
+    """Get the content type of a tile from its leading bytes.
+
+    Args:
+        content : The tile content.
+
+    Returns:
+        str : The MIME type of the tile.
+    """
+    if content.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    return "image/png"
+
+
+def start_tile_proxy(
+    cache_dir: str = None,
+    max_cache_mb: int = 1024,
+    max_fetches: int = 8,
+) -> TileProxy:
+    """Start the local tile proxy for map layers, replacing a running one.
+
+    Args:
+        cache_dir : Directory of the tile cache. Defaults to a folder in the temp directory.
+        max_cache_mb : Maximum size of the tile cache in MB. Defaults to 1024.
+        max_fetches : Maximum number of concurrent upstream tile requests. Defaults to 8.
+
+    Returns:
+        TileProxy : The running tile proxy.
+    """
+    global _tile_proxy
+
+    # Keep the port and registered layers so existing map layers keep working.
+    port = 0
+    upstreams = {}
+    resolvers = {}
+    if _tile_proxy is not None:
+        port = _tile_proxy.port
+        upstreams = dict(_tile_proxy._upstreams)
+        resolvers = dict(_tile_proxy._resolvers)
+    stop_tile_proxy()
+    if cache_dir is None:
+        cache_dir = pathlib.Path(tempfile.gettempdir()) / "arcgee_tiles"
+    cache = TileCache(cache_dir, int(max_cache_mb) * 1024 * 1024)
+    _tile_proxy = TileProxy(cache, max_fetches, port=port)
+    _tile_proxy._upstreams.update(upstreams)
+    _tile_proxy._resolvers.update(resolvers)
+    _tile_proxy.start()
+    return _tile_proxy
+
+
+def get_tile_proxy() -> "TileProxy | None":
+    """Get the running tile proxy.
+
+    Returns:
+        TileProxy | None : The running tile proxy, or None if it is not started.
+    """
+    return _tile_proxy
+
+
+def stop_tile_proxy() -> None:
+    """Stop the running tile proxy, keeping the cached tiles on disk."""
+    global _tile_proxy
+
+    if _tile_proxy is not None:
+        _tile_proxy.stop()
+        _tile_proxy = None